@@ -1,6 +1,19 @@
 import streamlit as st
 import os
+import re
+import ast
+import json
+import hashlib
 import logging
+import sqlite3
+import functools
+import threading
+import time
+import numpy as np
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 
 # ======================================================================
@@ -8,10 +21,12 @@ from dotenv import load_dotenv
 # ======================================================================
 
 # Azure 서비스 관련 라이브러리 (필수)
-from openai import AzureOpenAI
-from azure.search.documents import SearchClient
-from azure.search.documents.models import QueryType, VectorizedQuery
-from azure.core.credentials import AzureKeyCredential
+# openai/azure 등 무거운 SDK는 첫 화면 렌더링을 막지 않도록 사용하는 함수 안에서 임포트
+if TYPE_CHECKING:
+    import httpx
+    import requests
+    from openai import AzureOpenAI
+    from azure.search.documents import SearchClient
 
 # ======================================================================
 # 2. 환경 변수 설정 및 클라이언트 초기화
@@ -36,6 +51,28 @@ AZURE_SEARCH_INDEX_NAME_QA = os.getenv("AZURE_SEARCH_INDEX_NAME_QA")  # Q&A 인
 AZURE_SEARCH_INDEX_NAME_DICT = os.getenv(
     "AZURE_SEARCH_INDEX_NAME_DICT"
 )  # 용어사전 인덱스
+SEMANTIC_CACHE_PATH = os.getenv(
+    "SEMANTIC_CACHE_PATH", "semantic_cache.sqlite3"
+)  # LLM 응답 시맨틱 캐시 파일
+EMBEDDING_DIMENSIONS = 512  # 인덱스의 VECTOR_DIMENSION과 같아야 함
+SEMANTIC_CACHE_THRESHOLD = 0.95  # 캐시 적중으로 간주할 코사인 유사도 하한
+SEMANTIC_CACHE_STORAGE_DTYPE = np.float16  # 캐시 벡터의 디스크 저장 정밀도
+SEMANTIC_CACHE_MAX_ENTRIES = 256  # 네임스페이스별 캐시 항목 상한 (오래된 것부터 삭제)
+HTTP_POOL_MAXSIZE = 32  # 호스트별로 유지할 keep-alive 연결 수
+SEARCH_CATEGORIES = ("Java", "Database", "UI", "Python")  # 인덱스의 category 값
+CONTEXT_FIELD_MAX_CHARS = 400  # Context 한 필드에 넣을 최대 글자 수
+CONTEXT_MIN_RELATIVE_SCORE = 0.2  # 최고 점수 대비 이 비율 미만 결과는 제외 (RRF 기준)
+CONTEXT_MIN_RESULTS = 2  # 점수와 관계없이 항상 유지할 상위 결과 수
+CONTEXT_MAX_CHARS = 6000  # 프롬프트에 넣을 전체 Context 최대 글자 수
+ANALYSIS_CHUNK_LINES = 300  # 코드 분석 1회에 넣을 최대 라인 수
+ANALYSIS_CHUNK_OVERLAP = 20  # 청크 경계에 걸친 선언을 놓치지 않기 위한 중첩 라인 수
+ANALYSIS_MAX_WORKERS = 4  # 청크 분석 동시 호출 수
+HISTORY_MAX_ENTRIES = 50  # 세션별로 보관할 최대 검색 기록 수 (오래된 기록부터 삭제)
+SHORT_REQUEST_MAX_WORDS = 3  # 이 단어 수 이하의 용어 나열은 LLM 없이 키워드로 사용
+API_MAX_RETRIES = 3  # SDK 내장 재시도 횟수 (지수 백오프 + Retry-After 준수)
+API_RETRY_BACKOFF_MAX = 10  # Search 재시도 간 최대 대기 시간(초)
+CIRCUIT_FAILURE_THRESHOLD = 5  # 서킷을 여는 연속 실패 횟수
+CIRCUIT_RESET_SECONDS = 30  # 서킷이 열린 뒤 호출을 차단하는 시간(초)
 
 # 2.1. 필수 환경 변수 검사
 if not all(
@@ -52,31 +89,145 @@ if not all(
     )
     st.stop()
 
-# 2.2. 클라이언트 초기화
-try:
-    # Azure OpenAI 클라이언트
-    openai_client = AzureOpenAI(
+
+# 2.2. HTTP 연결 풀 (재실행 간 공유하여 TLS 핸드셰이크 재사용)
+@st.cache_resource
+def get_openai_http_client() -> "httpx.Client":
+    """Azure OpenAI 호출이 공유하는 keep-alive 연결 풀을 반환합니다."""
+    import httpx
+    from openai import DefaultHttpxClient
+
+    return DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_MAXSIZE * 2,
+            max_keepalive_connections=HTTP_POOL_MAXSIZE,
+        )
+    )
+
+
+@st.cache_resource
+def get_search_http_session() -> "requests.Session":
+    """3가지 Azure Search 클라이언트가 공유하는 keep-alive 연결 풀을 반환합니다."""
+    import requests
+    from requests.adapters import HTTPAdapter, Retry
+
+    session = requests.Session()
+    # 재시도는 azure-core 파이프라인이 담당하므로 urllib3 재시도는 끔 (SDK 기본 설정과 동일)
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_MAXSIZE,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# 2.3. 클라이언트 초기화 (재실행마다 다시 만들지 않도록 프로세스 단위로 캐시)
+@st.cache_resource
+def get_openai_client() -> "AzureOpenAI":
+    """Azure OpenAI 클라이언트를 생성합니다."""
+    from openai import AzureOpenAI
+
+    return AzureOpenAI(
         api_key=OPENAI_KEY,
         azure_endpoint=OPENAI_ENDPOINT,
         api_version="2024-12-01-preview",
+        http_client=get_openai_http_client(),
+        max_retries=API_MAX_RETRIES,
     )
+
+
+@st.cache_resource
+def get_search_clients() -> "dict[str, SearchClient]":
+    """3가지 인덱스(rules/qa/dict)별 Azure Search 클라이언트를 생성합니다."""
+    from azure.search.documents import SearchClient
+    from azure.core.credentials import AzureKeyCredential
+    from azure.core.pipeline.transport import RequestsTransport
+
     # Azure Search 인증 정보
     search_credential = AzureKeyCredential(AZURE_SEARCH_API_KEY)
 
-    # Azure Search 인덱스별 클라이언트 초기화 (3가지 인덱스)
-    search_client_rules = SearchClient(
-        AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_INDEX_NAME_RULES, search_credential
+    # 공유 세션을 사용하는 전송 계층 (세션은 재실행 간 유지되므로 클라이언트가 닫지 않음)
+    search_transport = RequestsTransport(
+        session=get_search_http_session(), session_owner=False
     )
-    search_client_qa = SearchClient(
-        AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_INDEX_NAME_QA, search_credential
+
+    # azure-core 재시도 정책 (429/5xx에 대해 지수 백오프, 최대 대기 시간 제한)
+    search_retry = dict(
+        retry_total=API_MAX_RETRIES,
+        retry_mode="exponential",
+        retry_backoff_max=API_RETRY_BACKOFF_MAX,
     )
-    search_client_dict = SearchClient(
-        AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_INDEX_NAME_DICT, search_credential
+
+    # Azure Search 인덱스별 클라이언트 초기화 (3가지 인덱스)
+    index_names = {
+        "rules": AZURE_SEARCH_INDEX_NAME_RULES,
+        "qa": AZURE_SEARCH_INDEX_NAME_QA,
+        "dict": AZURE_SEARCH_INDEX_NAME_DICT,
+    }
+    return {
+        key: SearchClient(
+            AZURE_SEARCH_ENDPOINT,
+            index_name,
+            search_credential,
+            transport=search_transport,
+            **search_retry,
+        )
+        for key, index_name in index_names.items()
+    }
+
+
+@st.cache_resource
+def get_search_executor() -> ThreadPoolExecutor:
+    """인덱스 검색 팬아웃에 쓰는 스레드 풀을 반환합니다. (요청마다 스레드를 새로 만들지 않음)"""
+    # 동시 세션의 검색이 연결 풀 크기만큼 겹칠 수 있도록 같은 상한을 사용
+    return ThreadPoolExecutor(
+        max_workers=HTTP_POOL_MAXSIZE, thread_name_prefix="search"
     )
 
-except Exception as e:
-    st.error(f"클라이언트 초기화 오류: {e}")
-    st.stop()
+
+# 2.4. 서킷 브레이커 (스로틀링/장애 중에는 실패가 확실한 호출을 기다리지 않고 즉시 차단)
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 외부 호출을 건너뛸 때 발생합니다."""
+
+
+class CircuitBreaker:
+    """연속 실패가 임계값에 도달하면 일정 시간 동안 호출을 차단하는 컨텍스트 매니저입니다."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+
+    def __enter__(self):
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                raise CircuitOpenError(
+                    f"{self.name} 서킷이 열려 있어 호출을 건너뜁니다."
+                )
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        with self._lock:
+            if exc_type is None:
+                self._failures = 0
+            # GeneratorExit 등 사용자 중단(BaseException)은 성공도 장애도 아니므로 집계를 유지
+            elif issubclass(exc_type, Exception):
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._open_until = time.monotonic() + self.reset_seconds
+                    self._failures = 0
+        return False
+
+
+@st.cache_resource
+def get_circuit_breaker(service: str) -> CircuitBreaker:
+    """서비스(openai, 인덱스별 search_*)마다 재실행 간 공유되는 서킷 브레이커를 반환합니다."""
+    return CircuitBreaker(service, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
 
 
 # ======================================================================
@@ -84,168 +235,646 @@ except Exception as e:
 # ======================================================================
 
 
-def generate_embedding(text: str) -> list:
+@st.cache_data(max_entries=2048, show_spinner=False)
+def _embed_cached(text: str) -> tuple[float, ...]:
+    """임베딩 API 결과를 텍스트 기준으로 캐싱합니다. (오류는 캐싱되지 않도록 예외를 그대로 전달)"""
+    with get_circuit_breaker("openai"):
+        response = get_openai_client().embeddings.create(
+            input=text,
+            model=OPENAI_DEPLOYMENT_EMBEDDING,
+            dimensions=EMBEDDING_DIMENSIONS,
+        )
+    return tuple(response.data[0].embedding)
+
+
+def generate_embedding(text: str) -> list[float]:
     """텍스트를 Azure OpenAI 임베딩 모델로 변환하여 벡터를 반환합니다."""
     try:
-        response = openai_client.embeddings.create(
-            input=text, model=OPENAI_DEPLOYMENT_EMBEDDING
-        )
-        return response.data[0].embedding
+        # 동일한 텍스트는 캐시에서 바로 반환 (재실행/반복 질문 시 API 호출 생략)
+        return list(_embed_cached(text))
     except Exception as e:
         logging.error(f"임베딩 API 호출 오류: {e}")
         return []
 
 
-def extract_keywords_with_llm(user_request: str) -> tuple:
-    """GPT 모델을 사용하여 사용자 요청에서 핵심 키워드 리스트와 검색 쿼리 문자열을 반환합니다."""
-    try:
-        # ... (프롬프트 내용)
-        prompt = f"""
-        다음 사용자 요청에서 명명 규칙 및 용어 검색에 필요한 핵심 키워드(Key Term)와 카테고리(Java, Database, UI, Python)를
-        최대 5개까지 쉼표로 구분하여 추출하세요. 요청: {user_request} ->
-        """
-        response = openai_client.chat.completions.create(
+class _SemanticCacheBucket:
+    """한 (네임스페이스, 벡터 차원)의 캐시 항목을 최대 max_entries개까지 담는 원형 버퍼입니다.
+
+    행렬은 필요할 때 두 배씩 늘리고, 가득 차면 가장 오래된 칸을 덮어써 추가가 O(1)입니다.
+    """
+
+    def __init__(self, dim: int, max_entries: int):
+        self.max_entries = max_entries
+        self.matrix = np.empty((min(16, max_entries), dim), dtype=np.float32)
+        self.size = 0
+        self._oldest = 0  # 가득 찬 뒤 다음에 덮어쓸 칸
+        self.responses, self.context_keys, self.row_ids = [], [], []
+
+    def append(self, vector: np.ndarray, response, context_key: str, row_id):
+        """항목을 추가하고, 밀려난 항목의 SQLite rowid를 반환합니다 (없으면 None)."""
+        if self.size < self.max_entries:
+            if self.size == len(self.matrix):
+                grown = np.empty(
+                    (min(2 * self.size, self.max_entries), self.matrix.shape[1]),
+                    dtype=np.float32,
+                )
+                grown[: self.size] = self.matrix
+                self.matrix = grown
+            slot, evicted = self.size, None
+            self.responses.append(response)
+            self.context_keys.append(context_key)
+            self.row_ids.append(row_id)
+            self.size += 1
+        else:
+            slot, evicted = self._oldest, self.row_ids[self._oldest]
+            self._oldest = (self._oldest + 1) % self.max_entries
+            self.responses[slot] = response
+            self.context_keys[slot] = context_key
+            self.row_ids[slot] = row_id
+        self.matrix[slot] = vector
+        return evicted
+
+
+class SemanticCache:
+    """요청 임베딩의 코사인 유사도를 기준으로 이전 LLM 응답을 재사용하는 캐시입니다.
+
+    네임스페이스마다 최근 max_entries개만 메모리와 SQLite에 남기고 오래된 항목부터 삭제합니다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        threshold: float,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (네임스페이스, 벡터 차원)별 캐시 항목
+        # (임베딩 차원을 바꿔도 이전 차원의 항목과 섞이지 않도록 차원까지 키로 사용)
+        self._buckets = {}
+
+        # SQLite에 저장된 이전 세션의 캐시를 메모리로 적재
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache "
+            "(namespace TEXT NOT NULL, vector BLOB NOT NULL, response TEXT NOT NULL,"
+            " dtype TEXT NOT NULL DEFAULT 'float32',"
+            " context_key TEXT NOT NULL DEFAULT '')"
+        )
+        # 이전 캐시 파일에 없던 컬럼 추가 (기존 행은 float32, Context 구분 없음으로 간주)
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(semantic_cache)")
+        }
+        for column, definition in (
+            ("dtype", "TEXT NOT NULL DEFAULT 'float32'"),
+            ("context_key", "TEXT NOT NULL DEFAULT ''"),
+        ):
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE semantic_cache ADD COLUMN {column} {definition}"
+                )
+        rows = self._conn.execute(
+            "SELECT rowid, namespace, vector, response, dtype, context_key "
+            "FROM semantic_cache ORDER BY rowid"
+        ).fetchall()
+        evicted = []
+        for row_id, namespace, vector_blob, response, dtype, context_key in rows:
+            # 디스크에는 float16으로 저장하지만, 행렬 연산(BLAS)은 float32로 수행
+            evicted_id = self._append(
+                namespace,
+                np.frombuffer(vector_blob, dtype=dtype).astype(np.float32),
+                json.loads(response),
+                context_key,
+                row_id,
+            )
+            if evicted_id is not None:
+                evicted.append(evicted_id)
+        # 상한을 넘는 이전 행(상한을 줄였거나 이전 버전이 쌓은 행)은 파일에서도 삭제
+        self._delete_rows(evicted)
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def _append(
+        self, namespace: str, vector: np.ndarray, response, context_key: str, row_id
+    ):
+        key = (namespace, vector.shape[0])
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _SemanticCacheBucket(
+                vector.shape[0], self.max_entries
+            )
+        return bucket.append(vector, response, context_key, row_id)
+
+    def _delete_rows(self, row_ids: list) -> None:
+        # SQLite 바인딩 변수 수 제한을 넘지 않도록 나눠서 삭제
+        with self._conn:
+            for start in range(0, len(row_ids), 500):
+                chunk = row_ids[start : start + 500]
+                self._conn.execute(
+                    f"DELETE FROM semantic_cache WHERE rowid IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+
+    def lookup(self, namespace: str, query_vector: list[float], context_key: str = ""):
+        """같은 context_key의 가장 유사한 항목이 임계값 이상이면 해당 응답을, 아니면 None을 반환합니다."""
+        query = self._normalize(query_vector)
+        key = (namespace, query.shape[0])
+        # 다른 세션의 store()와 겹쳐도 행렬과 응답 목록을 같은 시점 기준으로 읽도록 잠금
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return None
+
+            # 정규화된 벡터의 내적 = 코사인 유사도 (Context가 다른 항목은 후보에서 제외)
+            scores = bucket.matrix[: bucket.size] @ query
+            scores[np.asarray(bucket.context_keys) != context_key] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return bucket.responses[best]
+        return None
+
+    def store(
+        self,
+        namespace: str,
+        query_vector: list[float],
+        response,
+        context_key: str = "",
+    ) -> None:
+        """새 응답을 메모리와 SQLite에 함께 저장하고, 상한을 넘으면 가장 오래된 항목을 삭제합니다."""
+        vector = self._normalize(query_vector)
+        with self._lock:
+            # 정규화된 벡터는 float16 정밀도로도 코사인 비교에 충분하므로 절반 크기로 저장
+            cursor = self._conn.execute(
+                "INSERT INTO semantic_cache "
+                "(namespace, vector, response, dtype, context_key) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    vector.astype(SEMANTIC_CACHE_STORAGE_DTYPE).tobytes(),
+                    json.dumps(response, ensure_ascii=False),
+                    np.dtype(SEMANTIC_CACHE_STORAGE_DTYPE).name,
+                    context_key,
+                ),
+            )
+            evicted = self._append(
+                namespace, vector, response, context_key, cursor.lastrowid
+            )
+            if evicted is None:
+                self._conn.commit()
+            else:
+                self._delete_rows([evicted])  # 삽입과 삭제를 한 트랜잭션으로 커밋
+
+
+@st.cache_resource
+def get_semantic_cache() -> SemanticCache:
+    """재실행 간에 공유되는 시맨틱 캐시 인스턴스를 반환합니다."""
+    return SemanticCache(SEMANTIC_CACHE_PATH, SEMANTIC_CACHE_THRESHOLD)
+
+
+def semantic_cached(namespace: str):
+    """첫 번째 인자(사용자 요청)의 임베딩이 유사하면 캐시된 LLM 응답을 반환하는 데코레이터."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(user_request: str, *args):
+            query_vector = generate_embedding(user_request)
+            if not query_vector:
+                return func(user_request, *args)
+
+            cache = get_semantic_cache()
+            cached = cache.lookup(namespace, query_vector)
+            if cached is not None:
+                return cached
+
+            result = func(user_request, *args)
+            cache.store(namespace, query_vector, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# 키워드 추출 프롬프트 (카테고리 목록은 고정이므로 모듈 로드 시 한 번만 채움)
+_KEYWORDS_SYSTEM_MESSAGE = (
+    "You are a helpful assistant for keyword extraction. Respond in JSON."
+)
+_KEYWORDS_PROMPT_TMPL = f"""
+    다음 사용자 요청에서 명명 규칙 및 용어 검색에 필요한 핵심 키워드(Key Term)를 최대 5개까지 추출하고,
+    요청이 해당하는 카테고리를 {", ".join(SEARCH_CATEGORIES)} 중 하나로 판단하세요. (판단할 수 없으면 null)
+    요청: {{user_request}}
+    """.format
+
+# 키워드 추출 응답 스키마 (Structured Outputs로 형식을 서버에서 검증)
+_KEYWORDS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "keywords",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "keywords": {"type": "array", "items": {"type": "string"}},
+                "category": {
+                    "type": ["string", "null"],
+                    "enum": [*SEARCH_CATEGORIES, None],
+                },
+            },
+            "required": ["keywords", "category"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+@st.cache_data(
+    ttl=3600, max_entries=256, show_spinner=False
+)  # 완전히 같은 요청은 즉시 반환
+@semantic_cached("keywords_category")  # 표현만 다른 유사 요청은 임베딩 유사도로 재사용
+def _request_keywords(user_request: str) -> dict:
+    """GPT 모델로 키워드와 카테고리를 추출합니다. (오류는 캐싱되지 않도록 예외를 그대로 전달)"""
+    # JSON 스키마를 강제하여 한 번의 호출로 검증된 키워드 목록과 카테고리를 받음
+    with get_circuit_breaker("openai"):
+        response = get_openai_client().chat.completions.create(
             model=OPENAI_DEPLOYMENT_MODEL,
             messages=[
+                {"role": "system", "content": _KEYWORDS_SYSTEM_MESSAGE},
                 {
-                    "role": "system",
-                    "content": "You are a helpful assistant for keyword extraction.",
+                    "role": "user",
+                    "content": _KEYWORDS_PROMPT_TMPL(user_request=user_request),
                 },
-                {"role": "user", "content": prompt},
             ],
             temperature=0.0,  # 추출 작업이므로 낮은 온도로 설정
+            response_format=_KEYWORDS_RESPONSE_FORMAT,
+        )
+    result = json.loads(response.choices[0].message.content)
+    # 스키마로 타입은 보장되므로 공백 제거와 개수 제한만 적용 (strict 모드는 maxItems 미지원)
+    keywords_list = [k.strip() for k in result["keywords"] if k.strip()][:5]
+    if not keywords_list:
+        raise ValueError("키워드 추출 결과가 비어 있습니다.")
+    return {"keywords": keywords_list, "category": result["category"]}
+
+
+# 소문자 카테고리명 → 인덱스 category 값 (짧은 요청의 카테고리를 LLM 없이 판단할 때 사용)
+_CATEGORY_BY_LOWER_NAME = {category.lower(): category for category in SEARCH_CATEGORIES}
+# 조사/어미/문장부호가 붙지 않은 단어 (영문 식별자, 한글만으로 된 용어 후보)
+_BARE_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_HANGUL_TERM_PATTERN = re.compile(r"[가-힣]+")
+
+
+@st.cache_data(ttl=3600, max_entries=1024, show_spinner=False)
+def _dictionary_has_terms(terms: tuple[str, ...]) -> bool:
+    """모든 한글 용어가 용어사전의 korean 값과 정확히 일치하는지 확인합니다. (오류는 예외로 전달)"""
+    # 한글 용어는 _HANGUL_TERM_PATTERN으로 검증되어 따옴표/구분자가 섞이지 않음
+    with get_circuit_breaker("search_dict"):
+        results = get_search_clients()["dict"].search(
+            search_text="*",
+            filter=f"search.in(korean, '{','.join(terms)}', ',')",
+            select=["korean"],
+            top=50,
+        )
+        found = {result["korean"] for result in results}
+    return found.issuperset(terms)
+
+
+def _is_bare_term_request(words: list[str]) -> bool:
+    """요청이 키워드 추출이 필요 없는 용어 나열인지 판단합니다.
+
+    영문 식별자는 그대로 인정하고, 한글 단어는 조사/어미가 붙은 질문과 구분할 수
+    없으므로 용어사전에 같은 용어가 있을 때만 인정합니다.
+    """
+    hangul_terms = set()
+    for word in words:
+        if _HANGUL_TERM_PATTERN.fullmatch(word):
+            hangul_terms.add(word)
+        elif not _BARE_IDENTIFIER_PATTERN.fullmatch(word):
+            return False
+    if not hangul_terms:
+        return True
+    try:
+        return _dictionary_has_terms(tuple(sorted(hangul_terms)))
+    except Exception as e:
+        logging.error(f"Azure AI Search (Dictionary 용어 확인) 오류: {e}")
+        return False
+
+
+def extract_keywords_with_llm(user_request: str) -> tuple:
+    """GPT 모델을 사용하여 사용자 요청에서 핵심 키워드 리스트, 검색 쿼리 문자열, 카테고리를 반환합니다."""
+    # 용어만 몇 개 나열한 요청은 그 자체가 키워드이므로 LLM 호출 없이 바로 사용
+    words = user_request.split()
+    if 0 < len(words) <= SHORT_REQUEST_MAX_WORDS and _is_bare_term_request(words):
+        category = next(
+            (
+                _CATEGORY_BY_LOWER_NAME[word.lower()]
+                for word in words
+                if word.lower() in _CATEGORY_BY_LOWER_NAME
+            ),
+            None,
         )
-        keywords_str = response.choices[0].message.content.strip()
-        keywords_list = [k.strip() for k in keywords_str.split(",") if k.strip()]
-        search_query = " OR ".join(
-            keywords_list
-        )  # 키워드를 OR로 연결하여 검색 쿼리 생성
-        return keywords_list, search_query
+        return words, " | ".join(words), category
+
+    try:
+        result = _request_keywords(user_request)
+        keywords_list = result["keywords"]
+        # 단순 쿼리 구문의 OR 연산자(|)로 키워드를 연결하여 검색 쿼리 생성
+        search_query = " | ".join(keywords_list)
+        return keywords_list, search_query, result["category"]
     except Exception as e:
         logging.error(f"OpenAI 키워드 추출 오류: {e}")
-        return [user_request], user_request  # 오류 시 전체 요청을 키워드로 사용
+        # 오류 시 전체 요청을 키워드로 사용하고 카테고리 필터는 적용하지 않음
+        return [user_request], user_request, None
+
+
+# 파일 확장자별 검색 카테고리 (파일 분석 요청은 정형 문장이므로 LLM 없이 키워드를 구성)
+_FILE_TYPE_CATEGORIES = {
+    "JAVA": "Java",
+    "PY": "Python",
+    "SQL": "Database",
+    "DDL": "Database",
+}
 
 
-def search_dictionary_for_terms(user_request: str, search_query: str) -> list:
+def file_analysis_keywords(file_ext: str, analysis_request_text: str) -> tuple:
+    """파일 분석용 키워드 리스트, 검색 쿼리 문자열, 카테고리를 반환합니다.
+
+    알려진 확장자는 카테고리가 정해져 있으므로 키워드 추출 LLM 호출을 생략하고,
+    그 외(txt 등)는 extract_keywords_with_llm으로 판단합니다.
+    """
+    category = _FILE_TYPE_CATEGORIES.get(file_ext)
+    if category is None:
+        return extract_keywords_with_llm(analysis_request_text)
+    keywords_list = [category, "명명 규칙", "용어", "약어"]
+    return keywords_list, " | ".join(keywords_list), category
+
+
+class _ContextRow(dict):
+    """검색 결과 문서를 Context 템플릿에 채우기 위한 매핑 (없는 필드는 'N/A').
+
+    긴 본문 필드는 검색어와 일치한 하이라이트 구간을 우선 사용하고,
+    어느 쪽이든 CONTEXT_FIELD_MAX_CHARS 글자로 잘라 프롬프트 토큰을 줄입니다.
+    """
+
+    def __init__(self, result: dict, score: float | None, **extra):
+        super().__init__(result, score=score or 0.0, **extra)
+        for field, fragments in (result.get("@search.highlights") or {}).items():
+            self[field] = " … ".join(fragments)
+        for field, value in self.items():
+            if isinstance(value, str) and len(value) > CONTEXT_FIELD_MAX_CHARS:
+                self[field] = value[:CONTEXT_FIELD_MAX_CHARS] + "…"
+
+    def __missing__(self, key: str) -> str:
+        return "N/A"
+
+
+# Context 문자열 템플릿 (행마다 f-string을 새로 조립하지 않도록 format_map을 미리 바인딩)
+_DICT_CONTEXT_TMPL = (
+    "[Context: 용어사전(Score:{score:.2f})] **한국어**: {korean} **영문**: {english} "
+    "**약어**: {abbreviation} **설명**: {description}"
+).format_map
+_RULE_CONTEXT_TMPL = (
+    "[Context: {category} {type} Rule (Score:{score:.2f})] **규칙**: {rule_kr} "
+    "**예시**: {example_str}"
+).format_map
+_QA_CONTEXT_TMPL = (
+    "[Context: QA-{category} (Score:{score:.2f})] **질문**: {question} **답변**: {answer}"
+).format_map
+
+
+def _relevant_results(results) -> list:
+    """최고 점수 대비 CONTEXT_MIN_RELATIVE_SCORE 미만인 꼬리 결과를 제외합니다.
+
+    하이브리드 검색의 @search.score는 RRF 융합 점수(순위별 1/(60+rank)의 합)라 절대
+    임계값이 의미가 없으므로, 같은 질의의 최고 점수에 대한 비율로 판단합니다.
+    두 랭커(키워드/벡터)에 모두 잡힌 문서는 한쪽에만 잡힌 문서의 약 2배 점수이므로,
+    한쪽 랭커의 상위 결과가 잘리지 않도록 비율을 낮게 두고 상위 몇 건은 항상 유지합니다.
+    """
+    results = sorted(
+        results, key=lambda result: result.get("@search.score") or 0.0, reverse=True
+    )
+    if not results:
+        return results
+    cutoff = (results[0].get("@search.score") or 0.0) * CONTEXT_MIN_RELATIVE_SCORE
+    return [
+        result
+        for rank, result in enumerate(results)
+        if rank < CONTEXT_MIN_RESULTS or (result.get("@search.score") or 0.0) >= cutoff
+    ]
+
+
+def _vector_queries(query_vector: list[float], k: int) -> list:
+    """쿼리 벡터가 있으면 K-NN 벡터 검색 설정을, 없으면(텍스트 전용 검색) 빈 목록을 반환합니다."""
+    from azure.search.documents.models import VectorizedQuery
+
+    if not query_vector:
+        return []
+    return [
+        VectorizedQuery(
+            vector=query_vector,
+            k_nearest_neighbors=k,
+            fields="vector_embedding",
+            exhaustive=False,
+        )
+    ]
+
+
+def search_dictionary_for_terms(search_query: str, query_vector: list[float]) -> list:
     """하이브리드 검색을 사용하여 용어사전 인덱스에서 Context를 검색합니다."""
     try:
-        query_vector = generate_embedding(user_request)
-
-        vector_queries = []
-        if query_vector:
-            # 벡터 검색 설정 (K-NN)
-            vector_queries = [
-                VectorizedQuery(
-                    vector=query_vector,
-                    k_nearest_neighbors=5,
-                    fields="vector_embedding",
-                    exhaustive=False,
-                )
-            ]
+        # 벡터 검색 설정 (K-NN)
+        vector_queries = _vector_queries(query_vector, k=5)
 
         # Azure AI Search 실행 (하이브리드 검색)
-        results = search_client_dict.search(
-            search_text=search_query,
-            vector_queries=vector_queries,
-            select=["korean", "english", "abbreviation", "description"],
-            top=5,
-            query_type=QueryType.FULL,
-        )
+        # 결과는 순회 시점에 요청되므로 Context 변환까지 서킷 안에서 수행
+        with get_circuit_breaker("search_dict"):
+            results = get_search_clients()["dict"].search(
+                search_text=search_query,
+                vector_queries=vector_queries,
+                select=["korean", "english", "abbreviation", "description"],
+                highlight_fields="description",  # Context에는 본문 대신 일치 구간만 사용
+                highlight_pre_tag="**",
+                highlight_post_tag="**",
+                top=5,
+                query_type="simple",  # Lucene 파서가 필요 없는 키워드 쿼리
+            )
 
-        dictionary_context = []
-        for result in results:
-            score = result.get("@search.score") or 0.0
-            # Context 문자열 포맷팅
-            context = f"[Context: 용어사전(Score:{score:.2f})] **한국어**: {result.get('korean', 'N/A')} **영문**: {result.get('english', 'N/A')} **약어**: {result.get('abbreviation', 'N/A')} **설명**: {result.get('description', 'N/A')}"
-            dictionary_context.append(context)
+            dictionary_context = [
+                _DICT_CONTEXT_TMPL(
+                    _ContextRow(result, score=result.get("@search.score"))
+                )
+                for result in _relevant_results(results)
+            ]
         return dictionary_context
     except Exception as e:
         logging.error(f"Azure AI Search (Dictionary Hybrid) 오류: {e}")
-        return []
+        raise
 
 
-def search_rules_for_context(user_request: str, search_query: str) -> list:
+def search_rules_for_context(
+    search_query: str, query_vector: list[float], category: str | None = None
+) -> list:
     """하이브리드 검색을 사용하여 명명 규칙 인덱스에서 Context를 검색합니다."""
     try:
-        query_vector = generate_embedding(user_request)
-
-        vector_queries = []
-        if query_vector:
-            # 벡터 검색 설정 (K-NN)
-            vector_queries = [
-                VectorizedQuery(
-                    vector=query_vector,
-                    k_nearest_neighbors=5,
-                    fields="vector_embedding",
-                    exhaustive=False,
-                )
-            ]
+        # 벡터 검색 설정 (K-NN)
+        vector_queries = _vector_queries(query_vector, k=5)
 
-        # Azure AI Search 실행 (하이브리드 검색)
-        results = search_client_rules.search(
-            search_text=search_query,
-            vector_queries=vector_queries,
-            select=["category", "type", "rule_en", "rule_kr", "example"],
-            top=5,
-            query_type=QueryType.FULL,
+        # 카테고리 사전 필터 (공통 규칙은 항상 포함): ANN 탐색 범위를 해당 카테고리로 제한
+        category_filter = (
+            f"category eq '{category}' or category eq 'Common'" if category else None
         )
 
-        context_list = []
-        for result in results:
-            score = result.get("@search.score") or 0.0
-            examples = result.get("example", [])
-            example_str = ", ".join(examples) if examples else "예시 없음"
-            # Context 문자열 포맷팅
-            context = f"[Context: {result.get('category', 'N/A')} {result.get('type', 'N/A')} Rule (Score:{score:.2f})] **규칙**: {result.get('rule_kr', 'N/A')} **예시**: {example_str}"
-            context_list.append(context)
+        # Azure AI Search 실행 (하이브리드 검색)
+        # 결과는 순회 시점에 요청되므로 Context 변환까지 서킷 안에서 수행
+        with get_circuit_breaker("search_rules"):
+            results = get_search_clients()["rules"].search(
+                search_text=search_query,
+                vector_queries=vector_queries,
+                filter=category_filter,
+                vector_filter_mode="preFilter",
+                select=["category", "type", "rule_kr", "example"],
+                highlight_fields="rule_kr",  # Context에는 본문 대신 일치 구간만 사용
+                highlight_pre_tag="**",
+                highlight_post_tag="**",
+                top=5,
+                query_type="simple",  # Lucene 파서가 필요 없는 키워드 쿼리
+            )
+
+            context_list = [
+                _RULE_CONTEXT_TMPL(
+                    _ContextRow(
+                        result,
+                        score=result.get("@search.score"),
+                        example_str=result.get("example") or "예시 없음",
+                    )
+                )
+                for result in _relevant_results(results)
+            ]
         return context_list
     except Exception as e:
         logging.error(f"Azure AI Search (Rules Hybrid) 오류: {e}")
-        return []
+        raise
 
 
-def search_qa_for_context(user_request: str, search_query: str) -> list:
+def search_qa_for_context(
+    search_query: str, query_vector: list[float], category: str | None = None
+) -> list:
     """하이브리드 검색을 사용하여 Q&A 인덱스에서 Context를 검색합니다."""
     try:
-        query_vector = generate_embedding(user_request)
-
-        vector_queries = []
-        if query_vector:
-            # 벡터 검색 설정 (K-NN)
-            vector_queries = [
-                VectorizedQuery(
-                    vector=query_vector,
-                    k_nearest_neighbors=3,
-                    fields="vector_embedding",
-                    exhaustive=False,
-                )
-            ]
-
-        # Azure AI Search 실행 (하이브리드 검색)
-        results = search_client_qa.search(
-            search_text=search_query,
-            vector_queries=vector_queries,
-            select=["category", "question", "answer"],
-            top=3,
-            query_type=QueryType.FULL,
-        )
+        # 벡터 검색 설정 (K-NN)
+        vector_queries = _vector_queries(query_vector, k=3)
+
+        # Azure AI Search 실행 (하이브리드 검색, 카테고리 사전 필터)
+        # 결과는 순회 시점에 요청되므로 Context 변환까지 서킷 안에서 수행
+        with get_circuit_breaker("search_qa"):
+            results = get_search_clients()["qa"].search(
+                search_text=search_query,
+                vector_queries=vector_queries,
+                filter=f"category eq '{category}'" if category else None,
+                vector_filter_mode="preFilter",
+                select=["category", "question", "answer"],
+                highlight_fields="answer",  # Context에는 본문 대신 일치 구간만 사용
+                highlight_pre_tag="**",
+                highlight_post_tag="**",
+                top=3,
+                query_type="simple",  # Lucene 파서가 필요 없는 키워드 쿼리
+            )
 
-        context_list = []
-        for result in results:
-            score = result.get("@search.score") or 0.0
-            # Context 문자열 포맷팅
-            context = f"[Context: QA-{result.get('category', 'N/A')} (Score:{score:.2f})] **질문**: {result.get('question', 'N/A')} **답변**: {result.get('answer', 'N/A')}"
-            context_list.append(context)
+            context_list = [
+                _QA_CONTEXT_TMPL(_ContextRow(result, score=result.get("@search.score")))
+                for result in _relevant_results(results)
+            ]
         return context_list
     except Exception as e:
         logging.error(f"Azure AI Search (QA Hybrid) 오류: {e}")
-        return []
+        raise
 
 
-def generate_response_with_llm(user_request: str, context_list: list) -> str:
-    """검색된 Context를 활용하여 사용자 요청에 대한 최종 답변을 생성합니다."""
-    context_str = "\n".join(context_list)
-    system_prompt = f"""
+class _PartialContext(Exception):
+    """일부 검색이 실패한 결과를 캐시에 남기지 않고 호출부로 전달하기 위한 예외입니다."""
+
+    def __init__(self, contexts: tuple):
+        super().__init__("일부 인덱스 검색이 실패했습니다.")
+        self.contexts = contexts
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _retrieve_all_context_cached(
+    user_request: str, search_query: str, category: str | None
+) -> tuple:
+    """임베딩을 한 번만 생성한 뒤 3가지 인덱스 검색을 스레드 풀에서 동시에 실행합니다.
+
+    모든 검색이 성공한 결과만 캐시되며, 실패가 섞이면 _PartialContext로 전달합니다.
+    """
+    # 3가지 검색이 같은 요청 벡터를 공유하므로 임베딩 API는 1회만 호출
+    query_vector = generate_embedding(user_request)
+
+    # SearchClient 호출은 네트워크 I/O 동안 GIL을 놓으므로 스레드만으로 대기 시간을 겹칠 수 있음
+    executor = get_search_executor()
+    futures = (
+        executor.submit(search_rules_for_context, search_query, query_vector, category),
+        executor.submit(search_dictionary_for_terms, search_query, query_vector),
+        executor.submit(search_qa_for_context, search_query, query_vector, category),
+    )
+    # 임베딩 실패(텍스트 전용 검색)도 불완전한 결과로 보고 캐싱하지 않음
+    failed = not query_vector
+    contexts = []
+    for future in futures:
+        try:
+            contexts.append(future.result())
+        except Exception:
+            # 오류는 각 검색 함수에서 이미 기록됨
+            contexts.append([])
+            failed = True
+
+    if failed:
+        raise _PartialContext(tuple(contexts))
+    return tuple(contexts)
+
+
+def retrieve_all_context(
+    user_request: str, search_query: str, category: str | None = None
+) -> tuple:
+    """3가지 인덱스의 (규칙, 용어사전, Q&A) Context를 반환합니다.
+
+    같은 (요청, 검색어, 카테고리) 조합은 10분 동안 캐시된 결과를 그대로 반환하며,
+    실패한 검색은 빈 목록으로 대체합니다.
+    """
+    try:
+        return _retrieve_all_context_cached(user_request, search_query, category)
+    except _PartialContext as partial:
+        return partial.contexts
+
+
+def merge_context(*context_groups: list) -> list:
+    """인덱스별 Context를 합치면서 중복 행을 제거하고 전체 길이를 CONTEXT_MAX_CHARS로 제한합니다.
+
+    앞 인덱스의 긴 결과가 뒤 인덱스(Q&A 등)를 밀어내지 않도록 남은 글자 수를 남은
+    인덱스 수로 나눠 배정하고(앞에서 덜 쓴 몫은 뒤로 이월), 몫을 넘는 행은 건너뜁니다.
+    """
+    merged, seen, total_chars = [], set(), 0
+    for remaining_groups, group in zip(
+        range(len(context_groups), 0, -1), context_groups
+    ):
+        group_budget = (CONTEXT_MAX_CHARS - total_chars) // remaining_groups
+        group_chars = 0
+        for row in group:
+            # '[Context: ...]' 라벨(인덱스명, 점수)을 제외한 본문 앞부분으로 중복 판단
+            key = row.split("] ", 1)[-1][:120]
+            if key in seen or group_chars + len(row) > group_budget:
+                continue
+            seen.add(key)
+            merged.append(row)
+            group_chars += len(row)
+        total_chars += group_chars
+    return merged
+
+
+# 최종 답변 시스템 프롬프트의 고정 부분 (호출마다 Context만 이어 붙임)
+_RESPONSE_SYSTEM_PROMPT_HEADER = """
     당신은 코딩 명명 규칙을 준수하는 전문가입니다. 사용자의 요청에 따라 새로운 변수명이나 함수명을 생성하고,
     명명 규칙 또는 용어에 대한 질문에 답변해야 합니다.
     
@@ -257,44 +886,73 @@ def generate_response_with_llm(user_request: str, context_list: list) -> str:
 
     **검색된 규칙 및 용어 (Context):**
     ---
-    {context_str}
-    ---
     """
+
+
+def _context_fingerprint(context_list: list) -> str:
+    """검색된 Context 목록의 지문을 반환합니다 (답변 캐시 항목을 Context별로 구분).
+
+    같은 질문이라도 검색된 Context가 다르면 다른 답변이 나와야 하므로 질문 임베딩만으로는
+    캐시 항목을 구분하지 않습니다. 네임스페이스는 카테고리별로만 나눠 항목 수 상한을 공유합니다.
+    """
+    return hashlib.sha256("\n".join(context_list).encode("utf-8")).hexdigest()[:16]
+
+
+def generate_response_with_llm(
+    user_request: str, context_list: list, category: str | None = None
+) -> Iterator[str]:
+    """검색된 Context를 활용하여 사용자 요청에 대한 최종 답변을 토큰 단위로 스트리밍합니다."""
+    # 같은 카테고리/Context에서 유사한 요청의 답변이 캐시에 있으면 LLM 호출 없이 한 번에 반환
+    query_vector = generate_embedding(user_request)
+    cache = get_semantic_cache()
+    cache_namespace = f"response:{category or '-'}"
+    context_key = _context_fingerprint(context_list)
+    if query_vector:
+        cached = cache.lookup(cache_namespace, query_vector, context_key)
+        if cached is not None:
+            yield cached
+            return
+
+    system_prompt = (
+        _RESPONSE_SYSTEM_PROMPT_HEADER + "\n".join(context_list) + "\n    ---\n    "
+    )
+    answer_chunks = []
     try:
-        # 최종 답변 생성
-        response = openai_client.chat.completions.create(
-            model=OPENAI_DEPLOYMENT_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_request},
-            ],
-            temperature=0.3,  # 답변 생성에 적합한 온도 설정
-        )
-        return response.choices[0].message.content
+        # 최종 답변 생성 (stream=True: 첫 토큰부터 바로 화면에 표시)
+        with get_circuit_breaker("openai"):
+            response = get_openai_client().chat.completions.create(
+                model=OPENAI_DEPLOYMENT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_request},
+                ],
+                temperature=0.3,  # 답변 생성에 적합한 온도 설정
+                stream=True,
+            )
+            # 스트림 도중 끊기는 경우도 실패로 집계되도록 서킷 안에서 수신
+            for chunk in response:
+                # Azure는 콘텐츠 필터 결과만 담긴 빈 choices 청크를 보내기도 함
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                answer_chunks.append(delta)
+                yield delta
     except Exception as e:
         logging.error(f"OpenAI 최종 응답 생성 오류: {e}")
-        return f"요청 처리 중 오류가 발생했습니다. (오류: {e})"
+        yield f"요청 처리 중 오류가 발생했습니다. (오류: {e})"
+        return
+
+    # 스트리밍이 정상 종료된 답변만 캐시에 저장
+    if query_vector:
+        cache.store(cache_namespace, query_vector, "".join(answer_chunks), context_key)
 
 
 # ======================================================================
 # 4. 파일 분석 및 코드 검토 기능 함수
 # ======================================================================
-def analyze_code_with_llm(file_name: str, code_content: str, context_list: list) -> str:
-    """업로드된 코드 내용과 규칙 컨텍스트를 기반으로 명명 규칙 위반을 분석합니다."""
-
-    # 1. 파일 유형 파악
-    file_type = file_name.split(".")[-1].upper() if "." in file_name else "UNKNOWN"
-
-    # 2. Context 통합
-    context_str = "\n".join(context_list)
-
-    # 3. 코드 내용에 라인 번호 추가 (LLM이 위반 라인을 정확히 지목하도록 돕기 위함)
-    numbered_content = "\n".join(
-        f"{i+1:04d}: {line}" for i, line in enumerate(code_content.splitlines())
-    )
-
-    system_prompt = f"""
-    당신은 코딩 명명 규칙을 준수하는 전문가입니다. 사용자가 업로드한 '{file_name}' 파일의 '{file_type}' 코드 내용을 분석하여,
+# 코드 분석 시스템 프롬프트 (청크마다 f-string을 다시 조립하지 않도록 format을 미리 바인딩)
+_ANALYSIS_SYSTEM_PROMPT_TMPL = """
+    당신은 코딩 명명 규칙을 준수하는 전문가입니다. 사용자가 업로드한 '{file_name}' 파일의 '{file_type}' 코드 내용({scope})을 분석하여,
     **반드시** 아래 '검색된 규칙 및 용어'를 참고하여 명명 규칙을 위반한 모든 명칭(변수명, 함수명, 클래스명, DB 객체명 등)을 찾으세요.
 
     **응답 형식:**
@@ -312,50 +970,253 @@ def analyze_code_with_llm(file_name: str, code_content: str, context_list: list)
     ---
     {numbered_content}
     ---
+    """.format
+
+
+def _analyze_code_chunk(
+    file_name: str,
+    file_type: str,
+    context_str: str,
+    numbered_content: str,
+    scope: str,
+    client: "AzureOpenAI",
+    breaker: CircuitBreaker,
+) -> Iterator[str]:
+    """라인 번호가 붙은 코드 조각 하나를 LLM으로 분석하여 결과를 토큰 단위로 스트리밍합니다.
+
+    작업 스레드에서도 호출되므로 클라이언트와 서킷 브레이커는 스크립트 스레드에서 받아 전달합니다.
     """
+    system_prompt = _ANALYSIS_SYSTEM_PROMPT_TMPL(
+        file_name=file_name,
+        file_type=file_type,
+        scope=scope,
+        context_str=context_str,
+        numbered_content=numbered_content,
+    )
 
     try:
         # 코드 분석 요청
-        response = openai_client.chat.completions.create(
-            model=OPENAI_DEPLOYMENT_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": f"'{file_name}' 파일에 대한 명명 규칙 위반 분석을 수행해 주세요.",
-                },
-            ],
-            temperature=0.1,  # 분석 정확도를 위해 낮은 온도로 설정
-        )
-        return response.choices[0].message.content
+        with breaker:
+            response = client.chat.completions.create(
+                model=OPENAI_DEPLOYMENT_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {
+                        "role": "user",
+                        "content": f"'{file_name}' 파일에 대한 명명 규칙 위반 분석을 수행해 주세요.",
+                    },
+                ],
+                temperature=0.1,  # 분석 정확도를 위해 낮은 온도로 설정
+                stream=True,
+            )
+            for chunk in response:
+                # Azure는 콘텐츠 필터 결과만 담긴 빈 choices 청크를 보내기도 함
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
     except Exception as e:
-        logging.error(f"OpenAI 코드 분석 오류: {e}")
-        return f"코드 분석 중 오류가 발생했습니다. (오류: {e})"
+        logging.error(f"OpenAI 코드 분석 오류 ({scope}): {e}")
+        yield f"코드 분석 중 오류가 발생했습니다. (오류: {e})"
+
+
+# 명명 규칙 분석에 필요한 선언부 라인을 찾는 경량 패턴 (파일 유형별, 모듈 로드 시 1회 컴파일)
+# SQL은 CREATE TABLE/VIEW/FUNCTION/PROCEDURE 헤더와 DECLARE 구문만 선언으로 봄 (RETURNS 등 제외)
+_SQL_DECLARATION_PATTERN = re.compile(
+    r"^[ \t]*(?:CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:GLOBAL\s+|LOCAL\s+)?TEMP(?:ORARY)?\s+)?"
+    r"(?:TABLE|(?:MATERIALIZED\s+)?VIEW|FUNCTION|PROCEDURE)\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+    r"[\w.\"`\[\]]+\s*(?P<params>\()?"
+    r"|(?P<declare>DECLARE)\b(?P<block>[ \t]*\r?$)?)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SQL_BEGIN_PATTERN = re.compile(r"\bBEGIN\b", re.IGNORECASE)
+_DECLARATION_PATTERNS = {
+    "JAVA": re.compile(
+        r"\b(?:class|interface|enum|record)\s+\w+"
+        r"|^\s*(?:@\w+\s+)*(?:(?:public|private|protected|static|final|abstract|synchronized|"
+        r"transient|volatile|default)\s+)*(?:<[\w<>?,.&\s\[\]]*>\s+)?"  # 제네릭 메서드의 <T> 등
+        r"(?!(?:return|throw|new|else|case|package|import)\b)"
+        r"[\w.]+(?:<[\w<>?,.\s\[\]]*>)?(?:\[\])*\s+\w+\s*(?:[(=;,:]|$)"
+        r"|\bfor\s*\(\s*(?:final\s+)?[\w.<>\[\]]+\s+\w+"
+        r"|\bcatch\s*\(\s*[\w.|\s]+\s+\w+\s*\)"
+    ),
+}
+
+
+def _python_declaration_lines(code_content: str) -> set[int]:
+    """파이썬 AST에서 이름을 정의하는 노드(함수/클래스/인자/대입 대상 등)의 라인 번호를 모읍니다."""
+    line_numbers = set()
+    for node in ast.walk(ast.parse(code_content)):
+        if isinstance(
+            node,
+            (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.arg, ast.alias),
+        ) or (
+            isinstance(node, (ast.Name, ast.Attribute))
+            and isinstance(node.ctx, ast.Store)
+        ):
+            line_numbers.add(node.lineno)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            line_numbers.add(node.lineno)
+    return line_numbers
+
+
+def _sql_statement_end(code_content: str, match: re.Match) -> int:
+    """선언 구문이 끝나는 위치를 찾습니다. (컬럼/인자 목록, DECLARE 변수 구간 포함)"""
+    if match.group("params"):
+        depth = 0
+        for position in range(match.start("params"), len(code_content)):
+            if code_content[position] == "(":
+                depth += 1
+            elif code_content[position] == ")":
+                depth -= 1
+                if depth == 0:
+                    return position
+        return len(code_content)
+    if match.group("declare"):
+        if match.group("block") is not None:
+            # PL/SQL 블록형 DECLARE는 BEGIN 전까지가 변수 선언 구간
+            begin = _SQL_BEGIN_PATTERN.search(code_content, match.end())
+            end = begin.start() if begin else len(code_content)
+            return len(code_content[:end].rstrip())
+        # T-SQL 한 줄형 DECLARE는 ;까지 (여러 줄에 걸친 변수 목록 포함)
+        end = code_content.find(";", match.end())
+        return len(code_content) if end == -1 else end
+    return match.end()
+
+
+def _sql_declaration_lines(code_content: str) -> set[int]:
+    """SQL 선언 구문(헤더와 괄호 속 컬럼/인자 목록, DECLARE 변수)의 라인 번호를 모읍니다."""
+    line_numbers = set()
+    for match in _SQL_DECLARATION_PATTERN.finditer(code_content):
+        first = code_content.count("\n", 0, match.start()) + 1
+        end = _sql_statement_end(code_content, match)
+        last = first + code_content.count("\n", match.start(), end)
+        line_numbers.update(range(first, last + 1))
+    return line_numbers
+
+
+def _declaration_line_numbers(
+    file_type: str, code_content: str, lines: list[str]
+) -> set[int] | None:
+    """명칭이 선언된 라인 번호(1부터)를 반환합니다. 추출할 수 없는 파일 유형이면 None."""
+    if file_type == "PY":
+        try:
+            return _python_declaration_lines(code_content)
+        except (SyntaxError, ValueError):
+            return None
+    if file_type in ("SQL", "DDL"):
+        return _sql_declaration_lines(code_content)
+    pattern = _DECLARATION_PATTERNS.get(file_type)
+    if pattern is None:
+        return None
+    return {number for number, line in enumerate(lines, 1) if pattern.search(line)}
+
+
+def analyze_code_with_llm(
+    file_name: str, code_content: str, context_list: list
+) -> Iterator[str]:
+    """업로드된 코드 내용과 규칙 컨텍스트를 기반으로 명명 규칙 위반을 분석하여 스트리밍합니다."""
+
+    # 1. 파일 유형 파악
+    file_type = file_name.split(".")[-1].upper() if "." in file_name else "UNKNOWN"
+
+    # 2. Context 통합
+    context_str = "\n".join(context_list)
+    # st.cache_resource 접근은 ScriptRunContext가 있는 스크립트 스레드에서만 수행
+    client, breaker = get_openai_client(), get_circuit_breaker("openai")
+
+    # 3. 코드 내용에 라인 번호 추가 (LLM이 위반 라인을 정확히 지목하도록 돕기 위함)
+    # ast와 같은 기준으로 개행만 나눔 (splitlines()는 \x0c, \u2028 등에서도 나눠 라인 번호가 어긋남)
+    lines = [
+        line.removesuffix("\r") for line in code_content.removesuffix("\n").split("\n")
+    ]
+    total = len(lines)
+    width = max(4, len(str(total)))
+    number_line = f"{{:0{width}d}}: {{}}".format  # 자릿수를 한 번만 계산한 포맷
+
+    # 명명 규칙 검토에는 선언부만 필요하므로 해당 라인만 발췌 (추출 불가 시 전체 코드 사용)
+    declared = _declaration_line_numbers(file_type, code_content, lines)
+    if declared:
+        line_numbers = sorted(declared)
+        scope_label = f"선언부 {len(line_numbers)}라인 발췌"
+    else:
+        line_numbers = list(range(1, total + 1))
+        scope_label = "전체 코드"
+    numbered_lines = [number_line(n, lines[n - 1]) for n in line_numbers]
+
+    if len(numbered_lines) <= ANALYSIS_CHUNK_LINES:
+        yield from _analyze_code_chunk(
+            file_name,
+            file_type,
+            context_str,
+            "\n".join(numbered_lines),
+            scope_label,
+            client,
+            breaker,
+        )
+        return
+
+    # 4. 큰 파일은 겹치는 구간으로 나누어 병렬 분석 (호출당 토큰 수와 전체 지연 시간 감소)
+    step = ANALYSIS_CHUNK_LINES - ANALYSIS_CHUNK_OVERLAP
+    windows = [
+        (start, min(start + ANALYSIS_CHUNK_LINES, len(numbered_lines)))
+        for start in range(0, len(numbered_lines) - ANALYSIS_CHUNK_OVERLAP, step)
+    ]
+
+    def line_range(window: tuple[int, int]) -> str:
+        start, end = window
+        return f"{line_numbers[start]}-{line_numbers[end - 1]}라인"
+
+    def analyze_window(window: tuple[int, int]) -> Iterator[str]:
+        start, end = window
+        return _analyze_code_chunk(
+            file_name,
+            file_type,
+            context_str,
+            "\n".join(numbered_lines[start:end]),
+            f"전체 {total}라인 중 {line_range(window)}, {scope_label}",
+            client,
+            breaker,
+        )
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(ANALYSIS_MAX_WORKERS, len(windows) - 1)
+    )
+    try:
+        # 첫 구간은 바로 스트리밍하고, 나머지 구간은 그동안 백그라운드에서 완성
+        rest_futures = [
+            executor.submit(lambda w: "".join(analyze_window(w)), window)
+            for window in windows[1:]
+        ]
+        for index, window in enumerate(windows):
+            if index:
+                yield "\n\n---\n\n"
+            yield f"#### 📄 {line_range(window)} 분석 결과\n\n"
+            if index == 0:
+                yield from analyze_window(windows[0])
+            else:
+                yield rest_futures[index - 1].result()
+    finally:
+        # 사용자가 중단/재실행하면(GeneratorExit) 남은 구간을 기다리지 않고 바로 반환
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
 # ======================================================================
 # 5. Streamlit UI 구성 및 통합 로직
 # ======================================================================
 
-# 5.1. Session State 초기화
-if "run_rag" not in st.session_state:
-    st.session_state.run_rag = False
-if "user_input" not in st.session_state:
-    st.session_state.user_input = ""
-if "is_processing" not in st.session_state:
-    st.session_state.is_processing = False
-if "show_warning" not in st.session_state:
-    st.session_state.show_warning = False
-if "history" not in st.session_state:
-    st.session_state.history = []
-if "show_warning_empty" not in st.session_state:
-    st.session_state.show_warning_empty = False
-if "current_result" not in st.session_state:
-    st.session_state.current_result = None
-if "show_result" not in st.session_state:
-    st.session_state.show_result = False
-if "uploaded_file" not in st.session_state:  # 파일 분석을 위한 세션 상태 추가
-    st.session_state.uploaded_file = None
+# 5.1. Session State 초기화 (없는 키만 기본값으로 채움)
+_SESSION_DEFAULTS = {
+    "run_rag": False,
+    "user_input": "",
+    "is_processing": False,
+    "show_warning": False,
+    "history": deque(maxlen=HISTORY_MAX_ENTRIES),
+    "show_warning_empty": False,
+    "current_result": None,
+    "show_result": False,
+    "uploaded_file": None,  # 파일 분석을 위한 세션 상태
+}
+for key, default in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, default)
 
 
 # 5.2. 콜백 함수 정의
@@ -439,8 +1300,10 @@ with st.sidebar:
     # 검색 기록 표시 섹션
     st.header("검색 기록")
     if st.session_state.history:
-        for i, item in enumerate(st.session_state.history[::-1]):
-            actual_index = len(st.session_state.history) - 1 - i
+        # 최신 기록부터 표시 (deque를 복사 없이 역순 순회)
+        history = st.session_state.history
+        for offset, item in enumerate(reversed(history)):
+            actual_index = len(history) - 1 - offset
             st.button(
                 f"📝 {item['question'][:30]}...",
                 key=f"hist_{actual_index}",
@@ -479,37 +1342,64 @@ with tab_file:
 
 
 # 통합 실행 버튼은 탭 외부에 배치하여, 두 입력 중 하나가 들어오면 동작하도록 함
-run_button = st.button(
-    "답변 생성",
-    type="primary",
-    disabled=st.session_state.is_processing,
-    on_click=start_integrated_process,
-    args=[uploaded_file],  # 파일 객체를 콜백 함수에 전달
-)
+# 버튼과 경고 영역을 fragment로 묶어, 입력 없이 클릭한 경우 이 영역만 다시 그림
+@st.fragment
+def render_run_button(uploaded_file):
+    """실행 버튼과 경고 메시지를 그리고, 실행이 시작되면 전체 앱을 재실행합니다."""
+    run_button = st.button(
+        "답변 생성",
+        type="primary",
+        disabled=st.session_state.is_processing,
+        on_click=start_integrated_process,
+        args=[uploaded_file],  # 파일 객체를 콜백 함수에 전달
+    )
+
+    # 실행이 시작된 경우에만 전체 앱을 재실행하여 6번 RAG 로직으로 진입
+    if run_button and st.session_state.run_rag:
+        st.rerun()
+
+    # 경고는 한 번만 표시하고 바로 해제 (추가 재실행 없음)
+    if st.session_state.show_warning:
+        st.warning("이미 답변을 생성하고 있습니다. 잠시만 기다려 주세요.")
+        st.session_state.show_warning = False
+    if st.session_state.show_warning_empty:
+        st.warning("질문을 입력하거나 분석할 파일을 업로드해 주세요.")
+        st.session_state.show_warning_empty = False
+
 
+render_run_button(uploaded_file)
 
-# 경고 메시지 표시 (나머지 코드는 동일)
-# ...
 # ======================================================================
 # 6. RAG 실행 로직 (통합 처리: 일반 질의 응답 및 파일 분석)
 # ======================================================================
-if st.session_state.run_rag and (
-    st.session_state.user_input or st.session_state.get("uploaded_file")
-):
+# 세션 상태는 키마다 조회 비용이 있으므로 블록 진입 시 한 번만 읽어 지역 변수로 사용
+session = st.session_state
+final_user_input = session.user_input
+file_to_analyze = session.get("uploaded_file")
+
+if session.run_rag and (final_user_input or file_to_analyze):
 
-    final_user_input = st.session_state.user_input
-    file_to_analyze = st.session_state.get("uploaded_file")
+    # 클라이언트는 실제 요청을 처리할 때 처음 생성 (이후 재실행에서는 캐시된 객체 재사용)
+    try:
+        get_openai_client()
+        get_search_clients()
+    except Exception as e:
+        st.error(f"클라이언트 초기화 오류: {e}")
+        session.is_processing = False
+        session.run_rag = False
+        st.stop()
 
     is_file_analysis = file_to_analyze is not None
 
     if is_file_analysis:
         # --- 6.1. 파일 분석 모드 ---
-        with st.spinner(
-            f"'{file_to_analyze.name}' 파일의 명명 규칙 위반 사항과 용어를 분석하고 있습니다..."
-        ):
-            try:
-                # 1. 파일 내용 읽기
-                code_content = file_to_analyze.read().decode("utf-8")
+        try:
+            with st.spinner(
+                f"'{file_to_analyze.name}' 파일의 명명 규칙 위반 사항과 용어를 분석하고 있습니다..."
+            ):
+                # 1. 파일 내용 읽기 (업로드 파일은 이미 메모리에 있으므로 버퍼를 복사 없이 한 번만 디코딩)
+                with file_to_analyze.getbuffer() as file_buffer:
+                    code_content = str(file_buffer, "utf-8")
 
                 # 2. 파일 타입 기반으로 키워드 추출/Context 검색을 위한 요청 텍스트 생성
                 file_ext = (
@@ -519,134 +1409,134 @@ if st.session_state.run_rag and (
                 )
                 analysis_request_text = f"규칙 분석 요청: {file_to_analyze.name} 파일 ({file_ext})의 명명, 용어, 관행"
 
-                # 키워드를 추출하여 하이브리드 검색 쿼리 생성
-                _, search_query = extract_keywords_with_llm(analysis_request_text)
-
-                # 3. Context 검색 (3가지 인덱스 모두 활용)
-                rules_context = search_rules_for_context(
-                    analysis_request_text, search_query
+                # 키워드를 구성하여 하이브리드 검색 쿼리 생성 (알려진 확장자는 LLM 호출 생략)
+                _, search_query, category = file_analysis_keywords(
+                    file_ext, analysis_request_text
                 )
-                dictionary_context = search_dictionary_for_terms(
-                    analysis_request_text, search_query
+
+                # 3. Context 검색 (3가지 인덱스 모두 활용, 병렬 실행)
+                rules_context, dictionary_context, qa_context = retrieve_all_context(
+                    analysis_request_text, search_query, category
                 )
-                qa_context = search_qa_for_context(analysis_request_text, search_query)
 
                 # 모든 Context 통합
-                all_context = rules_context + dictionary_context + qa_context
-
-                # 4. LLM 통분석 요청 (분석 함수 호출)
-                final_answer = analyze_code_with_llm(
-                    file_to_analyze.name, code_content, all_context
+                all_context = merge_context(
+                    rules_context, dictionary_context, qa_context
                 )
 
-                # 5. 결과를 세션 상태에 저장
-                result_data = {
-                    "question": f"[파일 분석] {file_to_analyze.name} ({file_ext})",
-                    "answer": final_answer,
-                    "metadata": {
-                        "분석_유형": "코드 명명 규칙 분석 (3개 인덱스 활용)",
-                        "파일_크기_bytes": len(code_content.encode("utf-8")),
-                        "검색_쿼리": search_query,
-                        "총_검색된_Context_수": len(all_context),
-                    },
-                    "rules_context": (
-                        "\n".join(rules_context)
-                        if rules_context
-                        else "규칙 Context 검색 결과 없음"
-                    ),
-                    "dictionary_context": (
-                        "\n".join(dictionary_context)
-                        if dictionary_context
-                        else "용어사전 Context 검색 결과 없음"
-                    ),
-                    "qa_context": (
-                        "\n".join(qa_context)
-                        if qa_context
-                        else "Q&A Context 검색 결과 없음"
-                    ),
-                }
-
-            except Exception as e:
-                st.error(f"파일 분석 파이프라인 오류: {e}")
-                st.session_state.is_processing = False
-                st.session_state.run_rag = False
-                st.stop()
+            # 4. LLM 통분석 요청 (분석 결과를 도착하는 대로 화면에 스트리밍)
+            final_answer = st.write_stream(
+                analyze_code_with_llm(file_to_analyze.name, code_content, all_context)
+            )
+
+            # 5. 결과를 세션 상태에 저장
+            result_data = {
+                "question": f"[파일 분석] {file_to_analyze.name} ({file_ext})",
+                "answer": final_answer,
+                "metadata": {
+                    "분석_유형": "코드 명명 규칙 분석 (3개 인덱스 활용)",
+                    "파일_크기_bytes": file_to_analyze.size,
+                    "검색_쿼리": search_query,
+                    "카테고리_필터": category,
+                    "총_검색된_Context_수": len(all_context),
+                },
+                "rules_context": (
+                    "\n".join(rules_context)
+                    if rules_context
+                    else "규칙 Context 검색 결과 없음"
+                ),
+                "dictionary_context": (
+                    "\n".join(dictionary_context)
+                    if dictionary_context
+                    else "용어사전 Context 검색 결과 없음"
+                ),
+                "qa_context": (
+                    "\n".join(qa_context)
+                    if qa_context
+                    else "Q&A Context 검색 결과 없음"
+                ),
+            }
+
+        except Exception as e:
+            st.error(f"파일 분석 파이프라인 오류: {e}")
+            session.is_processing = False
+            session.run_rag = False
+            st.stop()
 
     else:
         # --- 6.2. 일반 질의 응답 모드 ---
-        with st.spinner("전문가 답변과 Context를 검색하고 있습니다..."):
-            try:
+        try:
+            with st.spinner("전문가 답변과 Context를 검색하고 있습니다..."):
                 # 1. 키워드 추출
-                keywords_list, search_query = extract_keywords_with_llm(
+                keywords_list, search_query, category = extract_keywords_with_llm(
                     final_user_input
                 )
 
-                # 2. Context 검색 (3가지 인덱스)
-                rules_context = search_rules_for_context(final_user_input, search_query)
-                dictionary_context = search_dictionary_for_terms(
-                    final_user_input, search_query
+                # 2. Context 검색 (3가지 인덱스, 병렬 실행)
+                rules_context, dictionary_context, qa_context = retrieve_all_context(
+                    final_user_input, search_query, category
                 )
-                qa_context = search_qa_for_context(final_user_input, search_query)
 
                 # 3. 모든 Context 통합
-                all_context = rules_context + dictionary_context + qa_context
+                all_context = merge_context(
+                    rules_context, dictionary_context, qa_context
+                )
 
-                if not all_context:
-                    final_answer = (
-                        "죄송합니다. 관련된 명명 규칙이나 용어를 찾을 수 없습니다."
-                    )
-                else:
-                    # 4. 최종 응답 생성 (RAG 함수 호출)
-                    final_answer = generate_response_with_llm(
-                        final_user_input, all_context
-                    )
+            if not all_context:
+                final_answer = (
+                    "죄송합니다. 관련된 명명 규칙이나 용어를 찾을 수 없습니다."
+                )
+            else:
+                # 4. 최종 응답 생성 (토큰이 도착하는 대로 화면에 스트리밍)
+                final_answer = st.write_stream(
+                    generate_response_with_llm(final_user_input, all_context, category)
+                )
 
-                # 5. 결과를 세션 상태에 저장
-                result_data = {
-                    "question": final_user_input,
-                    "answer": final_answer,
-                    "metadata": {
-                        "분석_유형": "일반 질의 응답",
-                        "검색_쿼리": search_query,
-                        "키워드": keywords_list,
-                        "총_검색된_Context_수": len(all_context),
-                    },
-                    "rules_context": (
-                        "\n".join(rules_context) if rules_context else "Context 없음"
-                    ),
-                    "dictionary_context": (
-                        "\n".join(dictionary_context)
-                        if dictionary_context
-                        else "Context 없음"
-                    ),
-                    "qa_context": (
-                        "\n".join(qa_context) if qa_context else "Context 없음"
-                    ),
-                }
-
-            except Exception as e:
-                st.error(f"파이프라인 실행 중 오류가 발생했습니다. 상세 오류: {e}")
-                st.session_state.is_processing = False
-                st.session_state.run_rag = False
-                st.stop()
+            # 5. 결과를 세션 상태에 저장
+            result_data = {
+                "question": final_user_input,
+                "answer": final_answer,
+                "metadata": {
+                    "분석_유형": "일반 질의 응답",
+                    "검색_쿼리": search_query,
+                    "키워드": keywords_list,
+                    "카테고리_필터": category,
+                    "총_검색된_Context_수": len(all_context),
+                },
+                "rules_context": (
+                    "\n".join(rules_context) if rules_context else "Context 없음"
+                ),
+                "dictionary_context": (
+                    "\n".join(dictionary_context)
+                    if dictionary_context
+                    else "Context 없음"
+                ),
+                "qa_context": ("\n".join(qa_context) if qa_context else "Context 없음"),
+            }
+
+        except Exception as e:
+            st.error(f"파이프라인 실행 중 오류가 발생했습니다. 상세 오류: {e}")
+            session.is_processing = False
+            session.run_rag = False
+            st.stop()
 
     # 6. 기록에 추가 및 현재 결과 설정 (공통)
-    st.session_state.history.append(result_data)
-    st.session_state.current_result = result_data
-    st.session_state.show_result = True
+    session.history.append(result_data)
+    session.current_result = result_data
+    session.show_result = True
 
     # 7. 처리 완료 후 플래그 초기화
-    st.session_state.is_processing = False
-    st.session_state.run_rag = False
-    st.session_state.uploaded_file = None  # 파일 분석 완료 후 초기화
+    session.is_processing = False
+    session.run_rag = False
+    session.uploaded_file = None  # 파일 분석 완료 후 초기화
     st.rerun()
 
 
 # ======================================================================
 # 7. 결과 표시 로직
 # ======================================================================
-if st.session_state.show_result and st.session_state.current_result:
-    result = st.session_state.current_result
+result = session.current_result
+if session.show_result and result:
 
     # 파일 분석 결과는 별도 제목 사용
     if result["metadata"].get("분석_유형") == "코드 명명 규칙 분석 (3개 인덱스 활용)":
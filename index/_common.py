@@ -0,0 +1,250 @@
+import os
+import sys
+import logging
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+import numpy as np
+from dotenv import load_dotenv
+from openai import AzureOpenAI
+from azure.search.documents import SearchClient
+from azure.core.credentials import AzureKeyCredential
+
+# ======================================================================
+# add_vector_*.py 공통 환경 변수 및 설정
+# ======================================================================
+load_dotenv()
+logging.basicConfig(
+    level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+OPENAI_ENDPOINT = os.getenv("OPENAI_ENDPOINT")
+OPENAI_KEY = os.getenv("OPENAI_KEY")
+OPENAI_DEPLOYMENT_EMBEDDING = os.getenv("OPENAI_DEPLOYMENT_EMBEDDING")
+AZURE_SEARCH_ENDPOINT = os.getenv("AZURE_SEARCH_ENDPOINT")
+AZURE_SEARCH_API_KEY = os.getenv("AZURE_SEARCH_API_KEY")
+VECTOR_DIMENSION = 512  # 인덱스의 vector_search_dimensions와 같아야 함
+EMBEDDING_BATCH_SIZE = 256  # 한 번의 임베딩 요청에 담을 텍스트 수
+EMBEDDING_MAX_WORKERS = 4  # 동시에 보낼 임베딩 요청 수
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", ".embed_cache.sqlite"
+)  # 문서 임베딩 디스크 캐시 (내용 해시 기준)
+UPLOAD_BATCH_SIZE = 500  # 한 번의 업로드 요청에 담을 문서 수
+UPLOAD_MAX_WORKERS = 4  # 동시에 보낼 업로드 요청 수
+UPLOAD_MAX_RETRIES = 5  # 429/503 등 일시적 오류 시 SDK가 재시도할 횟수 (지수 백오프)
+
+
+# ======================================================================
+# A. 클라이언트 (프로세스당 한 번만 생성하여 연결 풀 재사용)
+# ======================================================================
+@lru_cache(maxsize=None)
+def get_openai_client() -> AzureOpenAI:
+    """임베딩 생성에 사용할 Azure OpenAI 클라이언트를 반환합니다."""
+    try:
+        return AzureOpenAI(
+            api_key=OPENAI_KEY,
+            azure_endpoint=OPENAI_ENDPOINT,
+            api_version="2024-12-01-preview",
+        )
+    except Exception as e:
+        logging.error(f"클라이언트 초기화 오류: {e}")
+        sys.exit(1)
+
+
+@lru_cache(maxsize=None)
+def get_search_client(index_name: str) -> SearchClient:
+    """인덱스별 Search 클라이언트를 반환합니다."""
+    try:
+        return SearchClient(
+            AZURE_SEARCH_ENDPOINT,
+            index_name,
+            AzureKeyCredential(AZURE_SEARCH_API_KEY),
+            retry_total=UPLOAD_MAX_RETRIES,
+            retry_mode="exponential",
+        )
+    except Exception as e:
+        logging.error(f"클라이언트 초기화 오류: {e}")
+        sys.exit(1)
+
+
+# ======================================================================
+# B. 임베딩 디스크 캐시
+# ======================================================================
+class EmbeddingCache:
+    """(임베딩 모델, 차원, 텍스트 SHA-256)를 키로 문서 임베딩을 SQLite에 보관합니다.
+
+    내용이 바뀌지 않은 문서는 재실행 시 API를 다시 호출하지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB)"
+        )
+
+    @staticmethod
+    def _key(text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{OPENAI_DEPLOYMENT_EMBEDDING}:{VECTOR_DIMENSION}:{digest}"
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """텍스트별 캐시된 벡터를 입력 순서대로 반환합니다 (없으면 None)."""
+        keys = [self._key(text) for text in texts]
+        found = {}
+        # SQLite 바인딩 변수 수 제한을 넘지 않도록 나눠서 조회
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            rows = self._conn.execute(
+                f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(rows)
+        return [
+            (
+                np.frombuffer(found[key], dtype=np.float32).tolist()
+                if key in found
+                else None
+            )
+            for key in keys
+        ]
+
+    def put_many(self, items: list[tuple[str, list[float]]]):
+        """(텍스트, 벡터) 목록을 캐시에 저장합니다."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                [
+                    (self._key(text), np.asarray(vector, dtype=np.float32).tobytes())
+                    for text, vector in items
+                ],
+            )
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache() -> EmbeddingCache:
+    """프로세스 공용 임베딩 디스크 캐시를 반환합니다."""
+    return EmbeddingCache(EMBEDDING_CACHE_PATH)
+
+
+# ======================================================================
+# C. 임베딩 생성 함수 (배치)
+# ======================================================================
+def _normalize_rows(embeddings: list[list[float]]) -> list[list[float]]:
+    """각 벡터를 L2 노름 1로 정규화합니다 (영벡터는 그대로 둠)."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1, norms)).tolist()
+
+
+def generate_embeddings(
+    texts: list[str], min_length: int = 0
+) -> list[list[float] | None]:
+    """여러 텍스트를 EMBEDDING_BATCH_SIZE개씩 묶어 배치별로 동시에 임베딩합니다.
+
+    min_length보다 짧은 텍스트는 임베딩하지 않습니다.
+    반환 목록은 입력 순서와 같으며, 임베딩하지 못한 항목은 None입니다.
+    """
+    client = get_openai_client()
+    embedding_cache = get_embedding_cache()
+    vectors = [None] * len(texts)
+    targets = [
+        (i, text)
+        for i, text in enumerate(texts)
+        if text and len(text.strip()) >= min_length
+    ]
+    # 이전 실행에서 같은 텍스트를 임베딩했다면 캐시된 벡터를 사용하고 나머지만 요청
+    cached = embedding_cache.get_many([text for _, text in targets])
+    misses = []
+    for (i, text), vector in zip(targets, cached):
+        if vector is None:
+            misses.append((i, text))
+        else:
+            vectors[i] = vector
+    targets = misses
+
+    batches = [
+        targets[start : start + EMBEDDING_BATCH_SIZE]
+        for start in range(0, len(targets), EMBEDDING_BATCH_SIZE)
+    ]
+
+    def embed_batch(batch: list[tuple[int, str]]):
+        return client.embeddings.create(
+            input=[text for _, text in batch],
+            model=OPENAI_DEPLOYMENT_EMBEDDING,
+            dimensions=VECTOR_DIMENSION,
+        )
+
+    # 배치들은 서로 독립적이므로 동시에 요청 (동시 요청 수는 QPM 한도를 고려해 제한)
+    with ThreadPoolExecutor(max_workers=EMBEDDING_MAX_WORKERS) as executor:
+        futures = {executor.submit(embed_batch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                response = future.result()
+            except Exception as e:
+                # 오류 발생 시 해당 배치의 첫 텍스트를 로깅하여 문제 해결에 도움
+                logging.error(
+                    f"임베딩 생성 실패 ({len(batch)}건, 첫 텍스트: '{batch[0][1][:50]}...') 오류: {e}"
+                )
+                continue
+
+            # 인덱스가 dotProduct 유사도를 쓰므로 단위 벡터로 정규화 (캐시에도 정규화된 값 저장)
+            embeddings = _normalize_rows([item.embedding for item in response.data])
+            # 응답의 index는 요청 input 내 위치이므로 원래 순서로 되돌려 배치
+            for item, embedding in zip(response.data, embeddings):
+                vectors[batch[item.index][0]] = embedding
+            embedding_cache.put_many(
+                [
+                    (batch[item.index][1], embedding)
+                    for item, embedding in zip(response.data, embeddings)
+                ]
+            )
+
+    return vectors
+
+
+# ======================================================================
+# D. 문서 배치 업로드 함수
+# ======================================================================
+def document_key(value) -> str:
+    """원본 ID를 인덱스 문서 키로 변환합니다.
+
+    키는 대소문자를 구분하므로, 원본 ID의 대소문자/공백만 바뀌어도 같은 문서가
+    새 문서로 중복 업로드되지 않도록 소문자로 정규화합니다.
+    """
+    return str(value).strip().lower()
+
+
+def upload_documents_in_batches(
+    index_name: str, documents: list[dict]
+) -> tuple[int, int]:
+    """문서를 UPLOAD_BATCH_SIZE개씩 나눠 동시에 업로드하고 (성공 수, 실패 수)를 반환합니다."""
+    search_client = get_search_client(index_name)
+    batches = [
+        documents[start : start + UPLOAD_BATCH_SIZE]
+        for start in range(0, len(documents), UPLOAD_BATCH_SIZE)
+    ]
+    success_count, failure_count = 0, 0
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(search_client.upload_documents, documents=batch): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                # 재시도 후에도 실패한 배치는 전체를 실패로 집계
+                logging.error(
+                    f"Azure Search 업로드 실패 ({len(futures[future])}건): {e}"
+                )
+                failure_count += len(futures[future])
+                continue
+
+            succeeded = sum(1 for res in results if res.succeeded)
+            success_count += succeeded
+            failure_count += len(results) - succeeded
+
+    return success_count, failure_count
@@ -0,0 +1,164 @@
+import os
+import argparse
+from functools import lru_cache
+from dotenv import load_dotenv
+from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.models import (
+    SearchFieldDataType,
+    SearchIndex,
+    SearchField,
+    SimpleField,
+    VectorSearch,
+    HnswAlgorithmConfiguration,
+    VectorSearchProfile,
+    ScalarQuantizationCompression,
+    ScalarQuantizationParameters,
+    RescoringOptions,
+)
+from azure.core.credentials import AzureKeyCredential
+
+# ======================================================================
+# create_index_*.py 공통 스키마 구성 요소 및 배포 함수
+# ======================================================================
+VECTOR_DIMENSION = 512  # index/_common.py의 VECTOR_DIMENSION과 같아야 함
+
+
+# ======================================================================
+# A. 공통 필드 및 Vector Search 설정
+# ======================================================================
+def build_key_field(filterable: bool = False) -> SearchField:
+    """문서 키인 id 필드를 만듭니다 (filterable은 인덱스마다 이미 배포된 값을 따름).
+
+    id로 $orderby 하는 질의가 없으므로 정렬용 컬럼은 만들지 않습니다.
+    """
+    return SimpleField(
+        name="id",
+        type=SearchFieldDataType.String,
+        key=True,
+        filterable=filterable,
+    )
+
+
+def build_vector_field(profile_name: str) -> SearchField:
+    """문서 임베딩을 담는 vector_embedding 필드를 만듭니다."""
+    return SearchField(
+        name="vector_embedding",
+        type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+        vector_search_dimensions=VECTOR_DIMENSION,
+        vector_search_profile_name=profile_name,
+        searchable=True,
+        hidden=True,  # SearchField는 retrievable 대신 hidden으로 반환 여부를 지정
+        stored=False,  # 검색 결과로 반환하지 않으므로 원본 벡터 사본은 저장하지 않음
+    )
+
+
+def build_vector_search(
+    profile_name: str, algorithm_name: str, compression_name: str
+) -> VectorSearch:
+    """HNSW 알고리즘과 int8 압축을 묶은 Vector Search 설정을 만듭니다.
+
+    이름은 인덱스마다 이미 배포된 값을 그대로 넘겨야 합니다 (변경 시 재생성 필요).
+    """
+    return VectorSearch(
+        profiles=[
+            VectorSearchProfile(
+                name=profile_name,
+                algorithm_configuration_name=algorithm_name,
+                compression_name=compression_name,
+            )
+        ],
+        algorithms=[
+            HnswAlgorithmConfiguration(
+                name=algorithm_name,
+                kind="hnsw",
+                parameters={
+                    # 일반적인 권장값 (m=4는 그래프 연결이 부족해 큰 ef_search로 보상해야 했음)
+                    "m": 16,
+                    "ef_construction": 200,
+                    "ef_search": 100,
+                    "metric": "dotProduct",  # 업로드 시 단위 벡터로 정규화하므로 내적 = 코사인
+                },
+            ),
+        ],
+        # 벡터 압축 (int8 스칼라 양자화: 저장/탐색 대역폭 4배 절감, 상위 후보는 원본 벡터로 재채점)
+        compressions=[
+            ScalarQuantizationCompression(
+                compression_name=compression_name,
+                parameters=ScalarQuantizationParameters(quantized_data_type="int8"),
+                rescoring_options=RescoringOptions(
+                    enable_rescoring=True,
+                    default_oversampling=4.0,
+                    rescore_storage_method="preserveOriginals",
+                ),
+            )
+        ],
+    )
+
+
+# ======================================================================
+# B. 인덱스 관리 클라이언트 (처음 사용할 때 한 번만 생성)
+# ======================================================================
+@lru_cache(maxsize=1)
+def get_index_client() -> SearchIndexClient:
+    """환경 변수의 Azure Search 접속 정보로 인덱스 관리 클라이언트를 반환합니다."""
+    load_dotenv()
+    search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
+    search_api_key = os.getenv("AZURE_SEARCH_API_KEY")
+
+    if not all([search_endpoint, search_api_key]):
+        raise ValueError("필수 환경 변수가 설정되어야 합니다.")
+
+    credential = AzureKeyCredential(search_api_key)
+    return SearchIndexClient(endpoint=search_endpoint, credential=credential)
+
+
+# ======================================================================
+# C. 인덱스 생성 또는 갱신 (--force-rebuild 시에만 삭제 후 재생성)
+# ======================================================================
+def parse_deploy_args() -> argparse.Namespace:
+    """배포 스크립트 공통 명령행 옵션을 해석합니다."""
+    # 호환되지 않는 스키마 변경(벡터 차원, 분석기 등)일 때만 기존 인덱스를 삭제 후 재생성
+    parser = argparse.ArgumentParser(description="Azure AI Search 인덱스 생성/갱신")
+    parser.add_argument(
+        "--force-rebuild",
+        action="store_true",
+        help="기존 인덱스를 삭제하고 새로 생성합니다 (업로드된 문서도 삭제됨).",
+    )
+    return parser.parse_args()
+
+
+def deploy_index(index: SearchIndex, force_rebuild: bool = False):
+    """인덱스를 생성/갱신하거나, force_rebuild이면 삭제 후 재생성합니다."""
+    index_client = get_index_client()
+
+    print(f"--- Azure AI Search Index Deployment: {index.name} ---")
+
+    # 1. 기존 인덱스 삭제 (--force-rebuild 지정 시에만)
+    if force_rebuild:
+        try:
+            print(f"1. Deleting existing index '{index.name}' if it exists...")
+            index_client.delete_index(index.name)
+            print("   -> Existing index deleted successfully.")
+        except Exception:
+            print("   -> Index did not exist or could not be deleted (continuing...).")
+    else:
+        print(
+            "1. Keeping existing index (pass --force-rebuild to delete and recreate)."
+        )
+
+    # 2. 인덱스 생성 또는 갱신 (변경이 없으면 no-op, 호환되는 변경은 문서와 벡터 그래프를 유지)
+    try:
+        print(
+            f"2. Creating or updating index '{index.name}' with Vector Search configuration..."
+        )
+        result = index_client.create_or_update_index(index)
+        print(
+            f"   -> Index '{result.name}' created or updated successfully with Vector Search."
+        )
+
+    except Exception as e:
+        print(f"   -> ERROR creating or updating index {index.name}: {e}")
+        print("   -> If the schema change is incompatible, rerun with --force-rebuild.")
+        raise
+
+    print("--- Deployment Complete. Index is ready for vector data upload. ---")
@@ -0,0 +1,15 @@
+import add_vector_naming_rules
+import add_vector_data_dictionary
+import add_vector_naming_convention_qa
+
+# ======================================================================
+# 세 인덱스 데이터를 한 프로세스에서 순서대로 업로드
+# (클라이언트와 연결 풀, 임베딩 캐시를 세 작업이 함께 재사용)
+# ======================================================================
+if __name__ == "__main__":
+    for loader in (
+        add_vector_naming_rules,
+        add_vector_data_dictionary,
+        add_vector_naming_convention_qa,
+    ):
+        loader.upload_data_with_vectors(loader.DATA_FILE_PATH)
@@ -1,25 +1,17 @@
-import os
+import sys
 import json
 import logging
-from dotenv import load_dotenv
-from openai import AzureOpenAI
-from azure.search.documents import SearchClient
-from azure.core.credentials import AzureKeyCredential
+
+# 클라이언트, 임베딩 캐시, 배치 업로드는 세 스크립트가 공유 (index/_common.py)
+from _common import (
+    document_key,
+    generate_embeddings,
+    upload_documents_in_batches,
+)
 
 # ======================================================================
 # 환경 변수 및 설정
 # ======================================================================
-load_dotenv()
-logging.basicConfig(
-    level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s"
-)
-
-# 환경 변수 재사용
-OPENAI_ENDPOINT = os.getenv("OPENAI_ENDPOINT")
-OPENAI_KEY = os.getenv("OPENAI_KEY")
-OPENAI_DEPLOYMENT_EMBEDDING = os.getenv("OPENAI_DEPLOYMENT_EMBEDDING")
-AZURE_SEARCH_ENDPOINT = os.getenv("AZURE_SEARCH_ENDPOINT")
-AZURE_SEARCH_API_KEY = os.getenv("AZURE_SEARCH_API_KEY")
 INDEX_NAME = "qna-convention-index"  # ⭐⭐ QA 인덱스 이름으로 변경 ⭐⭐
 
 # 파일 경로
@@ -27,53 +19,24 @@ DATA_FILE_PATH = (
     "data/naming_convention_qa.json"  # ⭐⭐ QA 데이터 파일 경로로 변경 ⭐⭐
 )
 
-if not os.path.exists(DATA_FILE_PATH):
-    logging.error(f"데이터 파일 경로 오류: {DATA_FILE_PATH} 파일을 찾을 수 없습니다.")
-    exit()
-
-# 클라이언트 초기화
-try:
-    openai_client = AzureOpenAI(
-        api_key=OPENAI_KEY,
-        azure_endpoint=OPENAI_ENDPOINT,
-        api_version="2024-12-01-preview",
-    )
-    search_credential = AzureKeyCredential(AZURE_SEARCH_API_KEY)
-    search_client = SearchClient(AZURE_SEARCH_ENDPOINT, INDEX_NAME, search_credential)
-except Exception as e:
-    logging.error(f"클라이언트 초기화 오류: {e}")
-    exit()
-
-
-# ======================================================================
-# A. 임베딩 생성 함수
-# ======================================================================
-def generate_embedding(text: str, client: AzureOpenAI) -> list[float]:
-    """텍스트를 Azure OpenAI text-embedding-3-small 모델로 임베딩합니다."""
-    if not text or len(text.strip()) < 5:
-        return None
-
-    try:
-        response = client.embeddings.create(
-            input=text, model=OPENAI_DEPLOYMENT_EMBEDDING
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        logging.error(f"임베딩 생성 실패 for text: '{text[:50]}...' 오류: {e}")
-        return None
-
 
 # ======================================================================
-# B. 데이터 임베딩 및 인덱스 업로드 (Push)
+# A. 데이터 임베딩 및 인덱스 업로드 (Push)
 # ======================================================================
 def upload_data_with_vectors(file_path: str):
     """JSON 파일을 읽어 벡터를 생성하고 Search Index에 업로드합니다."""
 
     print(f"데이터 파일 로드 시작: {file_path}")
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # 존재 여부를 미리 확인하지 않고 열기를 시도 (EAFP, 확인과 열기 사이의 경합 없음)
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        logging.error(f"데이터 파일 경로 오류: {file_path} 파일을 찾을 수 없습니다.")
+        sys.exit(1)
 
-    documents_to_upload = []
+    # 1. 임베딩 대상 문서와 텍스트 수집 (원래 순번은 기본 ID로 사용)
+    candidates = []
 
     for idx, doc in enumerate(data):
 
@@ -83,7 +46,7 @@ def upload_data_with_vectors(file_path: str):
             )
             continue
 
-        # 1. 임베딩할 텍스트 통합 (QA Index의 키에 맞게 수정)
+        # 임베딩할 텍스트 통합 (QA Index의 키에 맞게 수정)
         # 키: 'question', 'answer', 'category' 사용
         text_to_embed = (
             f"질문: {doc.get('question', '')}. "
@@ -91,12 +54,17 @@ def upload_data_with_vectors(file_path: str):
             f"카테고리: {doc.get('category', '')}"
         ).strip()
 
-        # 2. 임베딩 벡터 생성
-        vector = generate_embedding(text_to_embed, openai_client)
+        candidates.append((idx, doc, text_to_embed))
 
+    # 2. 임베딩 벡터 일괄 생성 (문서마다 요청하지 않고 배치 단위로 요청)
+    vectors = generate_embeddings([text for _, _, text in candidates], min_length=5)
+
+    documents_to_upload = []
+
+    for (idx, doc, _), vector in zip(candidates, vectors):
         if vector:
             # 3. 문서 구조 조정 및 벡터 필드 추가
-            doc["id"] = str(doc.get("id", idx + 1))
+            doc["id"] = document_key(doc.get("id", idx + 1))
             doc["vector_embedding"] = vector  # 인덱스의 벡터 필드 이름과 일치
 
             documents_to_upload.append(doc)
@@ -110,14 +78,11 @@ def upload_data_with_vectors(file_path: str):
         print(
             f"\n--- {len(documents_to_upload)}개의 문서 임베딩 완료. Azure Search에 업로드 시작 ({INDEX_NAME}) ---"
         )
-        try:
-            results = search_client.upload_documents(documents=documents_to_upload)
-            success_count = sum(1 for res in results if res.succeeded)
-            logging.info(
-                f"업로드 완료: {success_count}개 성공, {len(results) - success_count}개 실패."
-            )
-        except Exception as e:
-            logging.error(f"Azure Search 업로드 실패: {e}")
+        # 4. 인덱스에 배치 단위로 동시 업로드 (Upload Documents)
+        success_count, failure_count = upload_documents_in_batches(
+            INDEX_NAME, documents_to_upload
+        )
+        logging.info(f"업로드 완료: {success_count}개 성공, {failure_count}개 실패.")
 
     else:
         print("업로드할 유효한 문서가 없습니다.")
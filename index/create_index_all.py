@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import create_index_naming_rules
+import create_index_dictionary
+import create_index_naming_convention_qa
+from _schema import deploy_index, get_index_client, parse_deploy_args
+
+# ======================================================================
+# 세 인덱스를 한 프로세스에서 동시에 생성 또는 갱신
+# (요청은 서로 독립적이므로 왕복 지연을 합이 아닌 최댓값 수준으로 줄임)
+# ======================================================================
+if __name__ == "__main__":
+    force_rebuild = parse_deploy_args().force_rebuild
+    get_index_client()  # 스레드들이 같은 클라이언트를 쓰도록 미리 생성
+    builders = (
+        create_index_naming_rules,
+        create_index_dictionary,
+        create_index_naming_convention_qa,
+    )
+    with ThreadPoolExecutor(max_workers=len(builders)) as executor:
+        futures = [
+            executor.submit(deploy_index, builder.build_index(), force_rebuild)
+            for builder in builders
+        ]
+        # 하나라도 실패하면 나머지 배포가 끝난 뒤 예외를 다시 발생시킴
+        for future in futures:
+            future.result()
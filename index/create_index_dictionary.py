@@ -1,99 +1,47 @@
-import os
-from dotenv import load_dotenv
-from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
     SearchableField,
-    SimpleField,
     SearchFieldDataType,
     SearchIndex,
-    SearchField,  # SearchField 사용
-    VectorSearch,
-    HnswAlgorithmConfiguration,  # HNSW 알고리즘 설정
-    VectorSearchProfile,
+    ScoringProfile,
+    TextWeights,
 )
-from azure.core.credentials import AzureKeyCredential
 
-# ======================================================================
-# 환경 변수 및 설정
-# ======================================================================
-load_dotenv()
+# 키/벡터 필드, Vector Search 설정, 배포 절차는 세 스크립트가 공유 (index/_schema.py)
+from _schema import (
+    build_key_field,
+    build_vector_field,
+    build_vector_search,
+    deploy_index,
+    parse_deploy_args,
+)
 
+# ======================================================================
 # 인덱스 설정
+# ======================================================================
 INDEX_NAME = "dictionary-index"
-VECTOR_DIMENSION = 1536
 VECTOR_PROFILE_NAME = "dict-vector-profile"
 VECTOR_ALGORITHM_NAME = "dict-hnsw-algorithm"
-
-# Azure Search 접속 정보
-search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
-search_api_key = os.getenv("AZURE_SEARCH_API_KEY")
-
-if not all([search_endpoint, search_api_key]):
-    raise ValueError("필수 환경 변수가 설정되어야 합니다.")
-
-credential = AzureKeyCredential(search_api_key)
-index_client = SearchIndexClient(endpoint=search_endpoint, credential=credential)
-
-
-# ======================================================================
-# A. 벡터 필드 및 Vector Search 설정 정의
-# ======================================================================
-
-# 1. 벡터 필드 정의
-VECTOR_EMBEDDING_FIELD = SearchField(
-    name="vector_embedding",
-    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-    vector_search_dimensions=VECTOR_DIMENSION,
-    vector_search_profile_name=VECTOR_PROFILE_NAME,
-    searchable=True,
-    retrievable=False,
-)
-
-# 2. Vector Search 설정 (알고리즘 및 프로파일)
-COMMON_VECTOR_SEARCH = VectorSearch(
-    profiles=[
-        VectorSearchProfile(
-            name=VECTOR_PROFILE_NAME, algorithm_configuration_name=VECTOR_ALGORITHM_NAME
-        )
-    ],
-    algorithms=[
-        HnswAlgorithmConfiguration(
-            name=VECTOR_ALGORITHM_NAME,
-            kind="hnsw",
-            parameters={
-                "m": 4,
-                "ef_construction": 400,
-                "ef_search": 500,
-                "metric": "cosine",
-            },
-        ),
-    ],
-)
+VECTOR_COMPRESSION_NAME = "dict-scalar-quantization"
+SCORING_PROFILE_NAME = "dict-field-boost"
 
 
 # ======================================================================
-# B. 용어사전 인덱스 필드 정의 (기존 필드 + 벡터 필드)
+# A. 용어사전 인덱스 필드 정의 (기존 필드 + 벡터 필드)
 # ======================================================================
 
 dictionary_fields = [
     # 1. ID 필드
-    SimpleField(
-        name="id",
-        type=SearchFieldDataType.String,
-        key=True,
-        sortable=True,
-        filterable=True,
-    ),
+    build_key_field(filterable=True),
     # 2. Korean (분석기 이름을 문자열로 직접 지정)
     SearchableField(
         name="korean",
         type=SearchFieldDataType.String,
         filterable=True,
-        analyzer_name="ko.microsoft",
+        analyzer_name="ko.lucene",
     ),
     # 3. English (분석기 이름을 문자열로 직접 지정)
     SearchableField(
-        name="english", type=SearchFieldDataType.String, analyzer_name="en.microsoft"
+        name="english", type=SearchFieldDataType.String, analyzer_name="en.lucene"
     ),
     # 4. Abbreviation (분석기 이름을 문자열로 직접 지정)
     SearchableField(
@@ -103,42 +51,37 @@ dictionary_fields = [
     SearchableField(
         name="description",
         type=SearchFieldDataType.String,
-        analyzer_name="ko.microsoft",
+        analyzer_name="ko.lucene",
     ),
     # 6. 벡터 필드
-    VECTOR_EMBEDDING_FIELD,
+    build_vector_field(VECTOR_PROFILE_NAME),
 ]
 
 
-# ======================================================================
-# C. 인덱스 생성 및 배포 (삭제 후 재생성)
-# ======================================================================
-
-# 인덱스 객체 생성
-dictionary_index = SearchIndex(
-    name=INDEX_NAME,
-    fields=dictionary_fields,
-    vector_search=COMMON_VECTOR_SEARCH,
+# 키워드 검색 점수의 필드별 가중치 (한국어/영문 용어와 약어 일치를 우선, 나머지 필드는 1.0)
+FIELD_BOOST_PROFILE = ScoringProfile(
+    name=SCORING_PROFILE_NAME,
+    text_weights=TextWeights(
+        weights={"korean": 3.0, "english": 2.0, "abbreviation": 2.0}
+    ),
 )
 
-print(f"--- Azure AI Search Index Deployment: {INDEX_NAME} ---")
-
-# 1. 기존 인덱스 삭제
-try:
-    print(f"1. Deleting existing index '{INDEX_NAME}' if it exists...")
-    index_client.delete_index(INDEX_NAME)
-    print("   -> Existing index deleted successfully.")
-except Exception:
-    print("   -> Index did not exist or could not be deleted (continuing...).")
 
-# 2. 인덱스 재생성
-try:
-    print(f"2. Creating new index '{INDEX_NAME}' with Vector Search configuration...")
-    result = index_client.create_index(dictionary_index)
-    print(f"   -> Index '{result.name}' created successfully with Vector Search.")
+# ======================================================================
+# B. 인덱스 생성 또는 갱신 (--force-rebuild 시에만 삭제 후 재생성)
+# ======================================================================
+def build_index() -> SearchIndex:
+    """필드, Vector Search, 점수 프로필을 묶은 인덱스 객체를 만듭니다."""
+    return SearchIndex(
+        name=INDEX_NAME,
+        fields=dictionary_fields,
+        vector_search=build_vector_search(
+            VECTOR_PROFILE_NAME, VECTOR_ALGORITHM_NAME, VECTOR_COMPRESSION_NAME
+        ),
+        scoring_profiles=[FIELD_BOOST_PROFILE],
+        default_scoring_profile=SCORING_PROFILE_NAME,  # 질의에서 지정하지 않아도 항상 적용
+    )
 
-except Exception as e:
-    print(f"   -> ERROR creating index {INDEX_NAME}: {e}")
-    raise
 
-print("--- Deployment Complete. Index is ready for vector data upload. ---")
+if __name__ == "__main__":
+    deploy_index(build_index(), parse_deploy_args().force_rebuild)
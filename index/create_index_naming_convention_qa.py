@@ -1,140 +1,80 @@
-import os
-from dotenv import load_dotenv
-from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
     SearchableField,
-    SimpleField,
     SearchFieldDataType,
     SearchIndex,
-    SearchField,
-    VectorSearch,
-    HnswAlgorithmConfiguration,
-    VectorSearchProfile,
+    ScoringProfile,
+    TextWeights,
 )
-from azure.core.credentials import AzureKeyCredential
 
-# ======================================================================
-# 환경 변수 및 설정
-# ======================================================================
-load_dotenv()
+# 키/벡터 필드, Vector Search 설정, 배포 절차는 세 스크립트가 공유 (index/_schema.py)
+from _schema import (
+    build_key_field,
+    build_vector_field,
+    build_vector_search,
+    deploy_index,
+    parse_deploy_args,
+)
 
+# ======================================================================
 # 인덱스 설정
+# ======================================================================
 INDEX_NAME = "qna-convention-index"
-VECTOR_DIMENSION = 1536
 VECTOR_PROFILE_NAME = "qa-vector-profile"
 VECTOR_ALGORITHM_NAME = "qa-hnsw-algorithm"
-
-# Azure Search 접속 정보
-search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
-search_api_key = os.getenv("AZURE_SEARCH_API_KEY")
-
-if not all([search_endpoint, search_api_key]):
-    raise ValueError("필수 환경 변수가 설정되어야 합니다.")
-
-credential = AzureKeyCredential(search_api_key)
-index_client = SearchIndexClient(endpoint=search_endpoint, credential=credential)
+VECTOR_COMPRESSION_NAME = "qa-scalar-quantization"
+SCORING_PROFILE_NAME = "qa-field-boost"
 
 
 # ======================================================================
-# A. 벡터 필드 및 Vector Search 설정 정의
-# ======================================================================
-
-# 1. 벡터 필드 정의
-VECTOR_EMBEDDING_FIELD = SearchField(
-    name="vector_embedding",
-    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-    vector_search_dimensions=VECTOR_DIMENSION,
-    vector_search_profile_name=VECTOR_PROFILE_NAME,
-    searchable=True,
-    retrievable=False,
-)
-
-# 2. Vector Search 공통 설정
-COMMON_VECTOR_SEARCH = VectorSearch(
-    profiles=[
-        VectorSearchProfile(
-            name=VECTOR_PROFILE_NAME, algorithm_configuration_name=VECTOR_ALGORITHM_NAME
-        )
-    ],
-    algorithms=[
-        HnswAlgorithmConfiguration(
-            name=VECTOR_ALGORITHM_NAME,
-            kind="hnsw",
-            parameters={
-                "m": 4,
-                "ef_construction": 400,
-                "ef_search": 500,
-                "metric": "cosine",
-            },
-        ),
-    ],
-)
-
-
-# ======================================================================
-# B. Q&A 인덱스 필드 정의 (기존 필드 + 벡터 필드)
+# A. Q&A 인덱스 필드 정의 (기존 필드 + 벡터 필드)
 # ======================================================================
 
 qna_convention_fields = [
     # 1. ID 필드
-    SimpleField(
-        name="id",
-        type=SearchFieldDataType.String,
-        key=True,
-        sortable=True,
-        filterable=True,
-    ),
-    # 2. Category
+    build_key_field(filterable=True),
+    # 2. Category (필터/패싯 전용, 정렬 질의가 없으므로 sortable 미지정)
     SearchableField(
         name="category",
         type=SearchFieldDataType.String,
         facetable=True,
         filterable=True,
-        sortable=True,
         analyzer_name="keyword",
     ),
     # 3. Question
     SearchableField(
-        name="question", type=SearchFieldDataType.String, analyzer_name="ko.microsoft"
+        name="question", type=SearchFieldDataType.String, analyzer_name="ko.lucene"
     ),
     # 4. Answer
     SearchableField(
-        name="answer", type=SearchFieldDataType.String, analyzer_name="ko.microsoft"
+        name="answer", type=SearchFieldDataType.String, analyzer_name="ko.lucene"
     ),
     # 5. 벡터 필드
-    VECTOR_EMBEDDING_FIELD,
+    build_vector_field(VECTOR_PROFILE_NAME),
 ]
 
 
-# ======================================================================
-# C. 인덱스 생성 및 배포 (삭제 후 재생성)
-# ======================================================================
-
-# 인덱스 객체 생성
-qna_index = SearchIndex(
-    name=INDEX_NAME,
-    fields=qna_convention_fields,
-    vector_search=COMMON_VECTOR_SEARCH,
+# 키워드 검색 점수의 필드별 가중치 (질문 일치를 우선, 나머지 필드는 1.0)
+FIELD_BOOST_PROFILE = ScoringProfile(
+    name=SCORING_PROFILE_NAME,
+    text_weights=TextWeights(weights={"question": 3.0}),
 )
 
-print(f"--- Azure AI Search Index Deployment: {INDEX_NAME} ---")
-
-# 1. 기존 인덱스 삭제
-try:
-    print(f"1. Deleting existing index '{INDEX_NAME}' if it exists...")
-    index_client.delete_index(INDEX_NAME)
-    print("   -> Existing index deleted successfully.")
-except Exception:
-    print("   -> Index did not exist or could not be deleted (continuing...).")
 
-# 2. 인덱스 재생성
-try:
-    print(f"2. Creating new index '{INDEX_NAME}' with Vector Search configuration...")
-    result = index_client.create_index(qna_index)
-    print(f"   -> Index '{result.name}' created successfully with Vector Search.")
+# ======================================================================
+# B. 인덱스 생성 또는 갱신 (--force-rebuild 시에만 삭제 후 재생성)
+# ======================================================================
+def build_index() -> SearchIndex:
+    """필드, Vector Search, 점수 프로필을 묶은 인덱스 객체를 만듭니다."""
+    return SearchIndex(
+        name=INDEX_NAME,
+        fields=qna_convention_fields,
+        vector_search=build_vector_search(
+            VECTOR_PROFILE_NAME, VECTOR_ALGORITHM_NAME, VECTOR_COMPRESSION_NAME
+        ),
+        scoring_profiles=[FIELD_BOOST_PROFILE],
+        default_scoring_profile=SCORING_PROFILE_NAME,  # 질의에서 지정하지 않아도 항상 적용
+    )
 
-except Exception as e:
-    print(f"   -> ERROR creating index {INDEX_NAME}: {e}")
-    raise
 
-print("--- Deployment Complete. Index is ready for vector data upload. ---")
+if __name__ == "__main__":
+    deploy_index(build_index(), parse_deploy_args().force_rebuild)
@@ -1,153 +1,104 @@
-import os
-from dotenv import load_dotenv
-from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents.indexes.models import (
     SearchableField,
     SimpleField,
     SearchFieldDataType,
     SearchIndex,
-    SearchField,
-    VectorSearch,
-    HnswAlgorithmConfiguration,
-    VectorSearchProfile,
+    ScoringProfile,
+    TextWeights,
 )
-from azure.core.credentials import AzureKeyCredential
 
-# 1. 환경 변수 로드
-load_dotenv()
+# 키/벡터 필드, Vector Search 설정, 배포 절차는 세 스크립트가 공유 (index/_schema.py)
+from _schema import (
+    build_key_field,
+    build_vector_field,
+    build_vector_search,
+    deploy_index,
+    parse_deploy_args,
+)
 
 # ======================================================================
-# 환경 변수 및 설정
+# 인덱스 설정
 # ======================================================================
 INDEX_NAME = "coding-convention-index"
-VECTOR_DIMENSION = 1536
 VECTOR_PROFILE_NAME = "dict-vector-profile"
 VECTOR_ALGORITHM_NAME = "dict-hnsw-algorithm"
-
-search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
-search_api_key = os.getenv("AZURE_SEARCH_API_KEY")
-
-if not all([search_endpoint, search_api_key]):
-    raise ValueError("필수 환경 변수가 설정되어야 합니다.")
-
-credential = AzureKeyCredential(search_api_key)
-index_client = SearchIndexClient(endpoint=search_endpoint, credential=credential)
-
-
-# ======================================================================
-# A. 벡터 필드 및 Vector Search 설정 정의
-# ======================================================================
-
-# 1. 벡터 필드 정의
-VECTOR_EMBEDDING_FIELD = SearchField(
-    name="vector_embedding",
-    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-    vector_search_dimensions=VECTOR_DIMENSION,
-    vector_search_profile_name=VECTOR_PROFILE_NAME,
-    searchable=True,
-    retrievable=False,
-)
-
-# 2. Vector Search 공통 설정
-COMMON_VECTOR_SEARCH = VectorSearch(
-    profiles=[
-        VectorSearchProfile(
-            name=VECTOR_PROFILE_NAME, algorithm_configuration_name=VECTOR_ALGORITHM_NAME
-        )
-    ],
-    algorithms=[
-        HnswAlgorithmConfiguration(
-            name=VECTOR_ALGORITHM_NAME,
-            kind="hnsw",
-            parameters={
-                "m": 4,
-                "ef_construction": 400,
-                "ef_search": 500,
-                "metric": "cosine",
-            },
-        ),
-    ],
-)
+VECTOR_COMPRESSION_NAME = "dict-scalar-quantization"
+SCORING_PROFILE_NAME = "rules-field-boost"
 
 
 # ======================================================================
-# B. 코딩 규칙 인덱스 필드 정의 (기존 필드 + 벡터 필드)
+# A. 코딩 규칙 인덱스 필드 정의 (기존 필드 + 벡터 필드)
 # ======================================================================
 
 coding_convention_fields = [
     # 1. ID 필드
-    SimpleField(name="id", type=SearchFieldDataType.String, key=True, sortable=True),
-    # 2. Category
+    build_key_field(),
+    # 2. Category (필터/패싯 전용, 정렬 질의가 없으므로 sortable 미지정)
     SearchableField(
         name="category",
         type=SearchFieldDataType.String,
         facetable=True,
         filterable=True,
-        sortable=True,
         analyzer_name="standard",
     ),
-    # 3. Type
+    # 3. Type (필터/패싯 전용, 정렬 질의가 없으므로 sortable 미지정)
     SearchableField(
         name="type",
         type=SearchFieldDataType.String,
         facetable=True,
         filterable=True,
-        sortable=True,
         analyzer_name="standard",
     ),
-    # 4. rule_en
+    # 4. rule_en (영문 질의 매칭용, Context에는 rule_kr만 쓰므로 결과로 반환하지 않음)
     SearchableField(
-        name="rule_en", type=SearchFieldDataType.String, analyzer_name="en.microsoft"
+        name="rule_en",
+        type=SearchFieldDataType.String,
+        analyzer_name="en.lucene",
+        hidden=True,
     ),
     # 5. rule_kr
     SearchableField(
-        name="rule_kr", type=SearchFieldDataType.String, analyzer_name="ko.microsoft"
+        name="rule_kr", type=SearchFieldDataType.String, analyzer_name="ko.lucene"
     ),
-    # 6. example
+    # 6. example (예시 목록을 이어 붙인 단일 문자열, 요소별 필터가 없어 컬렉션 불필요)
     SearchableField(
-        name="example",
-        collection=True,
-        type=SearchFieldDataType.String,
-        analyzer_name="standard",
+        name="example", type=SearchFieldDataType.String, analyzer_name="standard"
     ),
-    # 7. id_num
+    # 7. id_num (필터/정렬 전용, 결과로 반환하지 않음)
     SimpleField(
-        name="id_num", type=SearchFieldDataType.Int32, filterable=True, sortable=True
+        name="id_num",
+        type=SearchFieldDataType.Int32,
+        filterable=True,
+        sortable=True,
+        hidden=True,
     ),
     # 8. 벡터 필드
-    VECTOR_EMBEDDING_FIELD,
+    build_vector_field(VECTOR_PROFILE_NAME),
 ]
 
 
-# ======================================================================
-# C. 인덱스 생성 및 배포 (삭제 후 재생성)
-# ======================================================================
-
-# 인덱스 객체 생성
-rules_index = SearchIndex(
-    name=INDEX_NAME,
-    fields=coding_convention_fields,
-    vector_search=COMMON_VECTOR_SEARCH,
+# 키워드 검색 점수의 필드별 가중치 (명명 예시와 규칙 본문 일치를 우선, 나머지 필드는 1.0)
+FIELD_BOOST_PROFILE = ScoringProfile(
+    name=SCORING_PROFILE_NAME,
+    text_weights=TextWeights(weights={"example": 3.0, "rule_kr": 2.0, "rule_en": 1.5}),
 )
 
-print(f"--- Azure AI Search Index Deployment: {INDEX_NAME} ---")
-
-# 1. 기존 인덱스 삭제
-try:
-    print(f"1. Deleting existing index '{INDEX_NAME}' if it exists...")
-    index_client.delete_index(INDEX_NAME)
-    print("   -> Existing index deleted successfully.")
-except Exception:
-    print("   -> Index did not exist or could not be deleted (continuing...).")
 
-# 2. 인덱스 재생성
-try:
-    print(f"2. Creating new index '{INDEX_NAME}' with Vector Search configuration...")
-    result = index_client.create_index(rules_index)
-    print(f"   -> Index '{result.name}' created successfully with Vector Search.")
+# ======================================================================
+# B. 인덱스 생성 또는 갱신 (--force-rebuild 시에만 삭제 후 재생성)
+# ======================================================================
+def build_index() -> SearchIndex:
+    """필드, Vector Search, 점수 프로필을 묶은 인덱스 객체를 만듭니다."""
+    return SearchIndex(
+        name=INDEX_NAME,
+        fields=coding_convention_fields,
+        vector_search=build_vector_search(
+            VECTOR_PROFILE_NAME, VECTOR_ALGORITHM_NAME, VECTOR_COMPRESSION_NAME
+        ),
+        scoring_profiles=[FIELD_BOOST_PROFILE],
+        default_scoring_profile=SCORING_PROFILE_NAME,  # 질의에서 지정하지 않아도 항상 적용
+    )
 
-except Exception as e:
-    print(f"   -> ERROR creating index {INDEX_NAME}: {e}")
-    raise
 
-print("--- Deployment Complete. Index is ready for vector data upload. ---")
+if __name__ == "__main__":
+    deploy_index(build_index(), parse_deploy_args().force_rebuild)
@@ -0,0 +1,255 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+
+# app.py는 모듈 로드 시 필수 환경 변수를 검사하므로 더미 값으로 채운 뒤 임포트
+for _name in (
+    "OPENAI_ENDPOINT",
+    "OPENAI_KEY",
+    "AZURE_SEARCH_ENDPOINT",
+    "AZURE_SEARCH_API_KEY",
+    "OPENAI_DEPLOYMENT_EMBEDDING",
+):
+    os.environ.setdefault(_name, "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+def _unit_vector(index: int, dim: int = 8) -> list[float]:
+    vector = [0.0] * dim
+    vector[index % dim] = 1.0
+    return vector
+
+
+class SemanticCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _row_count(self, namespace: str) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM semantic_cache WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+
+    def test_entry_cap_evicts_oldest_in_memory_and_on_disk(self):
+        cache = app.SemanticCache(self.db_path, threshold=0.95, max_entries=3)
+        for i in range(5):
+            cache.store("ns", _unit_vector(i), f"answer-{i}")
+
+        self.assertEqual(self._row_count("ns"), 3)
+        self.assertIsNone(cache.lookup("ns", _unit_vector(0)))
+        self.assertIsNone(cache.lookup("ns", _unit_vector(1)))
+        for i in range(2, 5):
+            self.assertEqual(cache.lookup("ns", _unit_vector(i)), f"answer-{i}")
+
+    def test_cap_is_per_namespace(self):
+        cache = app.SemanticCache(self.db_path, threshold=0.95, max_entries=2)
+        for i in range(3):
+            cache.store("a", _unit_vector(i), f"a-{i}")
+        cache.store("b", _unit_vector(0), "b-0")
+
+        self.assertEqual(self._row_count("a"), 2)
+        self.assertEqual(cache.lookup("b", _unit_vector(0)), "b-0")
+
+    def test_reload_trims_rows_over_the_cap(self):
+        cache = app.SemanticCache(self.db_path, threshold=0.95, max_entries=5)
+        for i in range(5):
+            cache.store("ns", _unit_vector(i), f"answer-{i}")
+        cache._conn.close()
+
+        reloaded = app.SemanticCache(self.db_path, threshold=0.95, max_entries=2)
+        self.assertEqual(self._row_count("ns"), 2)
+        self.assertIsNone(reloaded.lookup("ns", _unit_vector(2)))
+        self.assertEqual(reloaded.lookup("ns", _unit_vector(4)), "answer-4")
+
+    def test_context_key_must_match(self):
+        cache = app.SemanticCache(self.db_path, threshold=0.95)
+        cache.store("response:Java", _unit_vector(0), "with-ctx-1", context_key="c1")
+
+        self.assertEqual(
+            cache.lookup("response:Java", _unit_vector(0), context_key="c1"),
+            "with-ctx-1",
+        )
+        self.assertIsNone(
+            cache.lookup("response:Java", _unit_vector(0), context_key="c2")
+        )
+
+    def test_matrix_grows_past_initial_allocation(self):
+        cache = app.SemanticCache(self.db_path, threshold=0.99, max_entries=40)
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(40, 64)).tolist()
+        for i, vector in enumerate(vectors):
+            cache.store("ns", vector, i)
+
+        self.assertEqual(cache.lookup("ns", vectors[0]), 0)
+        self.assertEqual(cache.lookup("ns", vectors[39]), 39)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    @staticmethod
+    def _call(breaker: app.CircuitBreaker, exc: BaseException | None = None):
+        try:
+            with breaker:
+                if exc is not None:
+                    raise exc
+        except (Exception, GeneratorExit):
+            pass
+
+    def test_abort_between_failures_does_not_reset_count(self):
+        breaker = app.CircuitBreaker("test", failure_threshold=2, reset_seconds=60)
+        self._call(breaker, RuntimeError("backend error"))
+        self._call(breaker, GeneratorExit())
+        self._call(breaker, RuntimeError("backend error"))
+
+        with self.assertRaises(app.CircuitOpenError):
+            with breaker:
+                pass
+
+    def test_abort_from_closed_stream_is_not_a_failure(self):
+        breaker = app.CircuitBreaker("test", failure_threshold=1, reset_seconds=60)
+
+        def stream():
+            with breaker:
+                yield "first"
+                yield "second"
+
+        generator = stream()
+        next(generator)
+        generator.close()  # 사용자가 스트리밍 답변을 중간에 멈춘 경우
+
+        with breaker:  # 열리지 않아야 함
+            pass
+
+    def test_success_resets_count(self):
+        breaker = app.CircuitBreaker("test", failure_threshold=2, reset_seconds=60)
+        self._call(breaker, RuntimeError("backend error"))
+        self._call(breaker)
+        self._call(breaker, RuntimeError("backend error"))
+
+        with breaker:  # 연속 실패가 아니므로 열리지 않아야 함
+            pass
+
+
+def _rrf(*ranks: int) -> float:
+    """Azure AI Search 하이브리드 검색의 RRF 점수 (k=60, 랭커별 1/(k+rank)의 합)."""
+    return sum(1 / (60 + rank) for rank in ranks)
+
+
+class RelevantResultsTest(unittest.TestCase):
+    def test_keeps_single_ranker_hits_below_a_dual_ranker_top_hit(self):
+        results = [
+            {"id": "both-1", "@search.score": _rrf(1, 1)},
+            {"id": "both-3", "@search.score": _rrf(3, 4)},
+            {"id": "vector-2", "@search.score": _rrf(2)},
+            {"id": "keyword-2", "@search.score": _rrf(2)},
+            {"id": "keyword-40", "@search.score": _rrf(40)},
+        ]
+
+        kept = [result["id"] for result in app._relevant_results(results)]
+
+        self.assertEqual(
+            kept, ["both-1", "both-3", "vector-2", "keyword-2", "keyword-40"]
+        )
+
+    def test_drops_tail_far_below_the_top_score(self):
+        results = [
+            {"id": "both-1", "@search.score": _rrf(1, 1)},
+            {"id": "both-2", "@search.score": _rrf(2, 2)},
+            {"id": "vector-5", "@search.score": _rrf(5)},
+            {"id": "noise", "@search.score": 0.001},
+        ]
+
+        kept = [result["id"] for result in app._relevant_results(results)]
+
+        self.assertEqual(kept, ["both-1", "both-2", "vector-5"])
+
+    def test_always_keeps_minimum_top_results(self):
+        results = [
+            {"id": "top", "@search.score": 0.03},
+            {"id": "second", "@search.score": 0.001},
+            {"id": "third", "@search.score": 0.0005},
+        ]
+
+        kept = [result["id"] for result in app._relevant_results(results)]
+
+        self.assertEqual(kept, ["top", "second"])
+
+    def test_empty_results(self):
+        self.assertEqual(app._relevant_results(iter([])), [])
+
+
+def _declared(file_type: str, code_content: str) -> set[int]:
+    return app._declaration_line_numbers(
+        file_type, code_content, code_content.split("\n")
+    )
+
+
+class DeclarationLineNumbersTest(unittest.TestCase):
+    def test_java_generic_method_is_declaration(self):
+        code = (
+            "public class Repo {\n"
+            "    public <T> List<T> FindAllByType(Class<T> type) {\n"
+            "        return new ArrayList<>();\n"
+            "    }\n"
+            "    public static <K, V extends Comparable<V>> Map<K, V> sort_map(Map<K, V> m) {\n"
+            "}\n"
+        )
+
+        self.assertEqual(_declared("JAVA", code), {1, 2, 5})
+
+    def test_sql_create_statements_and_columns(self):
+        code = (
+            "CREATE TABLE users (\n"  # 1
+            "    user_id   VARCHAR(20) PRIMARY KEY,\n"
+            "    TOTAL_PRICE DECIMAL(10, 2)\n"
+            ");\n"  # 4
+            "\n"
+            "SELECT user_id FROM users;\n"  # 6
+            "CREATE OR REPLACE FUNCTION CalculateOrderTax(in_total_price DECIMAL)\n"
+            "RETURNS DECIMAL(10, 2)\n"  # 8
+            "AS\n"
+            "BEGIN\n"
+            "    RETURN in_total_price * 0.1;\n"
+            "END;\n"  # 12
+            "CREATE VIEW user_view AS SELECT user_id FROM users;\n"  # 13
+        )
+
+        self.assertEqual(_declared("SQL", code), {1, 2, 3, 4, 7, 13})
+
+    def test_sql_returns_and_column_like_lines_are_not_declarations(self):
+        code = (
+            "SELECT\n"
+            "    total_price DECIMAL\n"
+            "RETURNS DECIMAL(10, 2)\n"
+            "ALTER SESSION SET NLS_DATE_FORMAT = 'YYYY';\n"
+        )
+
+        self.assertEqual(_declared("DDL", code), set())
+
+    def test_sql_declare_forms(self):
+        code = (
+            "DECLARE @orderCount INT,\n"  # 1
+            "        @TOTAL money;\n"
+            "SET @orderCount = 0;\n"
+            "DECLARE\n"  # 4
+            "    v_total NUMBER;\n"
+            "    vUserName VARCHAR2(50);\n"
+            "BEGIN\n"
+            "    NULL;\n"
+            "END;\n"
+        )
+
+        self.assertEqual(_declared("SQL", code), {1, 2, 4, 5, 6})
+
+
+if __name__ == "__main__":
+    unittest.main()